@@ -0,0 +1,168 @@
+"""Arc consistency preprocessing of the cell domains.
+
+Board.cell_domain holds the dot values each position allows by its own
+regions. This module narrows those domains against the other positions
+until nothing changes (AC-3): a value must be completable into a domino
+with some neighbouring value that the regions both share allow, agree with
+every other position of an equal region, differ from values an unequal
+region has already fixed, and leave a sum region's total reachable by its
+other positions.
+"""
+
+from collections import deque
+from typing import Dict, List, Tuple
+from .structures import Board, ConstraintType
+
+
+def _partner_masks(dominoes: List[Tuple[int, int]]) -> List[int]:
+    """
+    Map each dot value to the bitmask of values it shares a domino with.
+    
+    Args:
+        dominoes: The available dominoes as (dots1, dots2) tuples
+        
+    Returns:
+        List whose entry v has bit w set if some domino has halves v and w
+    """
+    partners = [0] * (max((max(domino) for domino in dominoes), default=-1) + 1)
+    for dots1, dots2 in dominoes:
+        partners[dots1] |= 1 << dots2
+        partners[dots2] |= 1 << dots1
+    return partners
+
+
+def _pair_rules(board: Board) -> Dict[Tuple[int, int], List[Tuple[ConstraintType, int, int]]]:
+    """
+    Collect the constraints shared by each ordered pair of adjacent positions.
+    
+    Args:
+        board: The board to collect constraints for
+        
+    Returns:
+        Dictionary mapping (key, neighbour key) to (constraint type, value,
+        region size) for every constrained region containing both
+    """
+    rules = {}
+    for key, neighbors in board.adj.items():
+        for neighbor in neighbors:
+            shared = [
+                (board.regions[index].constraint.constraint_type,
+                 board.regions[index].constraint.value, board.regions[index].size)
+                for index in board.pos_to_regions.get(key, ())
+                if index in board.pos_to_regions.get(neighbor, ())
+            ]
+            if shared:
+                rules[key, neighbor] = shared
+    return rules
+
+
+def _revise(board: Board, key: int, domains: Dict[int, int], partners: List[int],
+            rules: Dict[Tuple[int, int], List[Tuple[ConstraintType, int, int]]], unknown: int) -> int:
+    """
+    Narrow the domain of one position against the domains of the others.
+    
+    Args:
+        board: The board the domains belong to
+        key: Packed key of the position to revise
+        domains: Current domain bitmask of every valid position
+        partners: Partner masks of the available dominoes
+        rules: Constraints shared by adjacent positions, from _pair_rules
+        unknown: Domain assumed for region positions that are not on the board
+        
+    Returns:
+        The revised domain bitmask
+    """
+    # Every position is covered by a domino together with one of its
+    # neighbours, whose value the regions they share must also allow
+    domain = 0
+    values = domains[key]
+    while values:
+        bit = values & -values
+        values ^= bit
+        dots = bit.bit_length() - 1
+        if dots >= len(partners):
+            continue
+        for neighbor in board.adj[key]:
+            mask = partners[dots] & domains[neighbor]
+            for constraint_type, value, size in rules.get((key, neighbor), ()):
+                if constraint_type == ConstraintType.EQUAL:
+                    mask &= bit
+                elif constraint_type == ConstraintType.NOT_EQUAL:
+                    mask &= ~bit
+                elif constraint_type == ConstraintType.SUM and isinstance(value, int):
+                    # The rest of the region adds between 0 and max_dots per position
+                    least = max(value - dots - (size - 2) * board.max_dots, 0)
+                    most = value - dots
+                    mask &= ((1 << (most + 1)) - (1 << least)) if least <= most else 0
+            if mask:
+                domain |= bit
+                break
+    
+    for index in board.pos_to_regions.get(key, ()):
+        region = board.regions[index]
+        constraint_type = region.constraint.constraint_type
+        others = [domains.get(other, unknown) for other in region.keys if other != key]
+        if constraint_type == ConstraintType.EQUAL:
+            for mask in others:
+                domain &= mask
+        elif constraint_type == ConstraintType.NOT_EQUAL:
+            for mask in others:
+                if not mask & (mask - 1):
+                    domain &= ~mask
+        elif constraint_type == ConstraintType.SUM and isinstance(region.constraint.value, int):
+            # The other positions add between their smallest and largest values
+            low = sum((mask & -mask).bit_length() - 1 for mask in others)
+            high = sum(mask.bit_length() - 1 for mask in others)
+            least = max(region.constraint.value - high, 0)
+            most = region.constraint.value - low
+            domain &= ((1 << (most + 1)) - (1 << least)) if least <= most else 0
+    return domain
+
+
+def ac3(board: Board, dominoes: List[Tuple[int, int]]) -> Dict[int, int]:
+    """
+    Narrow every position's domain until the domains are arc consistent.
+    
+    Values are only removed when no solution can use them, so the result
+    can replace Board.cell_domain. Tile counts are not considered: every
+    domino is treated as if it could be used more than once.
+    
+    Args:
+        board: The board to compute domains for
+        dominoes: The available dominoes as (dots1, dots2) tuples
+        
+    Returns:
+        Dictionary mapping packed position keys to a bitmask of the values
+        they can hold; an empty mask means the puzzle has no solution
+    """
+    domains = dict(board.cell_domain)
+    if not all(domains.values()):
+        return domains
+    partners = _partner_masks(dominoes)
+    rules = _pair_rules(board)
+    unknown = (1 << (board.max_dots + 1)) - 1
+    
+    # Positions whose domain depends on each position's domain
+    dependents = {key: set(neighbors) for key, neighbors in board.adj.items()}
+    for index in board._constrained_regions:
+        keys = [key for key in board.regions[index].keys if key in domains]
+        for key in keys:
+            dependents[key].update(keys)
+            dependents[key].discard(key)
+    
+    queue = deque(board._ordered_keys)
+    queued = set(queue)
+    while queue:
+        key = queue.popleft()
+        queued.discard(key)
+        domain = _revise(board, key, domains, partners, rules, unknown)
+        if domain == domains[key]:
+            continue
+        domains[key] = domain
+        if not domain:
+            return domains
+        for other in dependents[key]:
+            if other not in queued:
+                queued.add(other)
+                queue.append(other)
+    return domains
@@ -0,0 +1,99 @@
+"""Persistent on-disk cache of puzzle solutions.
+
+Solutions are stored as JSON files named after a hash of the puzzle's
+canonical form, so the same puzzle is found again however its file lists
+positions, regions or dominoes. The cache is off unless the environment
+variable PIPS_SOLVER_CACHE is set to a value other than "0"; its
+directory is pips_solver under XDG_CACHE_HOME (default ~/.cache).
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+from .structures import Board, unpack
+
+
+# Environment variable that turns the cache on
+CACHE_ENV = "PIPS_SOLVER_CACHE"
+
+# A cached placement: (row1, col1, row2, col2, dots1, dots2)
+CachedPlacement = Tuple[int, int, int, int, int, int]
+
+
+def enabled() -> bool:
+    """Check whether the solution cache is turned on."""
+    return os.environ.get(CACHE_ENV, "0") not in ("", "0")
+
+
+def cache_dir() -> str:
+    """Get the directory the cached solutions are stored in."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pips_solver")
+
+
+def canonical_key(board: Board) -> str:
+    """
+    Hash a board's puzzle into a key that ignores how it was listed.
+    
+    Args:
+        board: The board to hash
+        
+    Returns:
+        Hex digest identifying the puzzle and any dots already placed
+    """
+    dominoes = board.available_dominoes
+    signature = {
+        "cells": sorted(board.positions_by_key),
+        # Serialized one by one: constraint values need not be comparable
+        "regions": sorted(
+            json.dumps([region.constraint.constraint_type.value, region.constraint.value, sorted(region.keys)])
+            for region in board.regions
+        ),
+        "dominoes": sorted(sorted(domino) for domino in dominoes) if dominoes is not None else None,
+        "state": sorted(board.state.items()),
+    }
+    data = json.dumps(signature, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def get(key: str) -> Optional[List[CachedPlacement]]:
+    """
+    Look up the solution cached for a puzzle.
+    
+    Args:
+        key: The puzzle key from canonical_key
+        
+    Returns:
+        The cached placements, or None if there are none or they are unreadable
+    """
+    try:
+        with open(os.path.join(cache_dir(), key + ".json"), "rb") as f:
+            return [tuple(placement) for placement in json.loads(f.read())]
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def put(key: str, placements: List[Tuple[int, int, int, int]]) -> None:
+    """
+    Store the solution of a puzzle; failures to write are ignored.
+    
+    Args:
+        key: The puzzle key from canonical_key
+        placements: (key1, key2, dots1, dots2) of each placement
+    """
+    rows = []
+    for key1, key2, dots1, dots2 in placements:
+        pos1, pos2 = unpack(key1), unpack(key2)
+        rows.append([pos1.row, pos1.col, pos2.row, pos2.col, dots1, dots2])
+    directory = cache_dir()
+    path = os.path.join(directory, key + ".json")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename, so readers never see a partial file
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w") as f:
+            json.dump(rows, f)
+        os.replace(temp, path)
+    except OSError:
+        pass
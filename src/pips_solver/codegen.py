@@ -0,0 +1,152 @@
+"""Generation of puzzle-specific placement checks.
+
+Once a board is loaded its regions, constraints, cell domains and adjacency
+are fixed. This module partially evaluates Board.fits_keys for every ordered
+pair of adjacent positions: each generated check has the regions touched by
+the pair unrolled, with constraint values, region sizes and cell domains
+inlined as literals, and reads only the board's running region aggregates
+and its table of reachable sums.
+"""
+
+from functools import lru_cache
+from types import CodeType
+from typing import Callable, Dict, List, Tuple
+from .structures import Board, ConstraintType
+
+
+# Check of one placement over a fixed pair of positions: (dots1, dots2) -> bool
+PairCheck = Callable[[int, int], bool]
+
+
+@lru_cache(maxsize=64)
+def _compile(source: str) -> CodeType:
+    """
+    Compile generated source, reusing the code of boards seen before.
+    
+    Compiling is nearly all of the cost of generating checks. The code only
+    refers to the board through names bound when it is run, so boards of the
+    same shape, constraints and dominoes share it.
+    """
+    return compile(source, "<pips_codegen>", "exec")
+
+
+def _emit_region(lines: List[str], index: int, board: Board, dots: str, count: int, bits: str) -> None:
+    """
+    Emit the check of one region for the values a placement adds to it.
+    
+    Args:
+        lines: Source lines the check is appended to
+        index: Index of the region in board.regions
+        board: The board the check is generated for
+        dots: Expression for the sum of the added values
+        count: Number of values added
+        bits: Expression for the bitmask of the added values
+    """
+    region = board.regions[index]
+    constraint_type = region.constraint.constraint_type
+    value = region.constraint.value
+    seen = f"(M[{index}] | {bits})"
+    
+    if constraint_type == ConstraintType.EQUAL:
+        lines.append(f"    m = {seen}")
+        lines.append("    if m & (m - 1): return False")
+    elif constraint_type == ConstraintType.NOT_EQUAL:
+        lines.append(f"    if bin({seen}).count('1') != F[{index}] + {count}: return False")
+    elif not isinstance(value, int):
+        # Malformed value: defer to the generic check and its behaviour
+        lines.append(
+            f"    if not C{index}(S[{index}] + {dots}, F[{index}] + {count}, {seen}, V{index}, "
+            f"R[{region.size - count} - F[{index}]]): return False"
+        )
+    elif constraint_type == ConstraintType.GREATER_THAN:
+        # The smallest value present must exceed the bound
+        low = (1 << (value + 1)) - 1 if value >= 0 else 0
+        if low:
+            lines.append(f"    if {seen} & {low}: return False")
+    elif constraint_type == ConstraintType.LESS_THAN:
+        # The largest value present must stay below the bound
+        if value <= 0:
+            lines.append("    return False")
+        else:
+            lines.append(f"    if {seen} >> {value}: return False")
+    elif constraint_type == ConstraintType.SUM:
+        lines.append(f"    t = S[{index}] + {dots}")
+        if board._dot_values == set(range(board.max_dots + 1)):
+            # Every sum up to max_dots per empty position can be added
+            lines.append(
+                f"    if t > {value} or t + ({region.size - count} - F[{index}]) * {board.max_dots} < {value}: "
+                "return False"
+            )
+        else:
+            lines.append(
+                f"    if t > {value} or not R[{region.size - count} - F[{index}]] >> ({value} - t) & 1: "
+                "return False"
+            )
+
+
+def _emit_pair(board: Board, key1: int, key2: int) -> List[str]:
+    """
+    Emit the source of the placement check for one ordered pair of positions.
+    
+    Args:
+        board: The board the check is generated for
+        key1: Packed key of the first position
+        key2: Packed key of the second position
+        
+    Returns:
+        Source lines of a function taking (d1, d2)
+    """
+    lines = [
+        f"def fits_{key1}_{key2}(d1, d2):",
+        f"    if not ({board.cell_domain[key1]} >> d1 & {board.cell_domain[key2]} >> d2 & 1): return False",
+        "    b1 = 1 << d1",
+        "    b2 = 1 << d2",
+    ]
+    regions1 = board.pos_to_regions.get(key1, ())
+    regions2 = board.pos_to_regions.get(key2, ())
+    for index in regions1:
+        if index in regions2:
+            _emit_region(lines, index, board, "d1 + d2", 2, "b1 | b2")
+        else:
+            _emit_region(lines, index, board, "d1", 1, "b1")
+    for index in regions2:
+        if index not in regions1:
+            _emit_region(lines, index, board, "d2", 1, "b2")
+    lines.append("    return True")
+    return lines
+
+
+def build_pair_checks(board: Board) -> Dict[int, Tuple[Tuple[int, PairCheck], ...]]:
+    """
+    Generate and compile the placement checks of every adjacent pair.
+    
+    A check gives the same answer as Board.fits_keys for its pair of
+    positions, provided both are empty; occupancy is left to the caller.
+    
+    Args:
+        board: The board to generate checks for
+        
+    Returns:
+        Dictionary mapping each packed key to (neighbour key, check) pairs,
+        in the order of board.adj
+    """
+    source: List[str] = []
+    for key1, neighbors in board.adj.items():
+        for key2 in neighbors:
+            source.extend(_emit_pair(board, key1, key2))
+    
+    # The generated code reads the live aggregate lists, which the board
+    # updates in place
+    namespace = {
+        "S": board._region_sum, "F": board._region_filled, "M": board._region_seen,
+        "R": board._sum_reach,
+    }
+    for index, region in enumerate(board.regions):
+        namespace[f"C{index}"] = region._check
+        namespace[f"V{index}"] = region.constraint.value
+    exec(_compile("\n".join(source)), namespace)
+    
+    return {
+        key1: tuple((key2, namespace[f"fits_{key1}_{key2}"]) for key2 in neighbors)
+        for key1, neighbors in board.adj.items()
+    }
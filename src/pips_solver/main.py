@@ -34,19 +34,17 @@ def format_solution(solver: PipsSolver) -> str:
         min_row = min(pos.row for pos in board.valid_positions)
         min_col = min(pos.col for pos in board.valid_positions)
         
-        # Create a display grid with dots for invalid positions
-        grid = [["." for _ in range(max_col - min_col + 1)] for _ in range(max_row - min_row + 1)]
-        
-        # Mark valid but empty positions with spaces
+        # Flat display grid with dots for invalid positions; a single pass over
+        # the valid positions writes either the placed value or a space
+        width = max_col - min_col + 1
+        height = max_row - min_row + 1
+        grid = ["."] * (width * height)
         for pos in board.valid_positions:
-            grid[pos.row - min_row][pos.col - min_col] = " "
-        
-        # Fill in the dots
-        for pos, dots in board.state.items():
-            grid[pos.row - min_row][pos.col - min_col] = str(dots)
+            dots = board.get_dots(pos)
+            grid[(pos.row - min_row) * width + pos.col - min_col] = " " if dots is None else str(dots)
         
-        for row in grid:
-            lines.append(" ".join(row))
+        for r in range(height):
+            lines.append(" ".join(grid[r * width:(r + 1) * width]))
     
     lines.append("")
     lines.append(f"Placed {len(board.placed_dominoes)} dominoes:")
@@ -81,6 +79,20 @@ Example:
         help="Enable verbose output"
     )
     
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=1,
+        help="Number of processes to search with (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--portfolio",
+        action="store_true",
+        help="With -j, race searches trying dominoes in different orders "
+             "instead of splitting one search"
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -101,7 +113,14 @@ Example:
         # Solve the puzzle
         solver = PipsSolver(board)
         
-        if solver.solve():
+        if args.workers > 1 and args.portfolio:
+            solved = solver.solve_portfolio(args.workers)
+        elif args.workers > 1:
+            solved = solver.solve_parallel(args.workers)
+        else:
+            solved = solver.solve()
+        
+        if solved:
             print(format_solution(solver))
             return 0
         else:
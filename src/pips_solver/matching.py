@@ -0,0 +1,90 @@
+"""Maximum matching of the empty positions of a board.
+
+Every domino covers two adjacent positions, one of each colour of a
+checkerboard, so a tiling of the empty positions is a perfect matching of
+the bipartite graph between the two colours. When no such matching exists
+no placement of dominoes can complete the board, whatever the constraints.
+The matching is found with the Hopcroft-Karp algorithm.
+"""
+
+from collections import deque
+from typing import Dict, Optional, Sequence
+from .structures import KEY_COL_BITS, KEY_COL_MASK, Board
+
+
+def max_matching(graph: Dict[int, Sequence[int]]) -> int:
+    """
+    Find the size of a maximum matching of a bipartite graph.
+    
+    Args:
+        graph: Dictionary mapping each left vertex to its right neighbours
+        
+    Returns:
+        Number of edges in a maximum matching
+    """
+    match_left: Dict[int, Optional[int]] = dict.fromkeys(graph)
+    match_right: Dict[int, int] = {}
+    layer: Dict[int, int] = {}
+    
+    def augment(left: int) -> bool:
+        # Follow the layers to a free right vertex, flipping the path
+        for right in graph[left]:
+            mate = match_right.get(right)
+            if mate is None or (layer.get(mate) == layer[left] + 1 and augment(mate)):
+                match_left[left] = right
+                match_right[right] = left
+                return True
+        # Dead end: no shortest augmenting path passes through here
+        layer[left] = -1
+        return False
+    
+    size = 0
+    while True:
+        # Layer the left vertices by the length of the shortest alternating
+        # path reaching them from a free left vertex
+        layer.clear()
+        queue = deque()
+        for left, right in match_left.items():
+            if right is None:
+                layer[left] = 0
+                queue.append(left)
+        found = False
+        while queue:
+            left = queue.popleft()
+            for right in graph[left]:
+                mate = match_right.get(right)
+                if mate is None:
+                    found = True
+                elif mate not in layer:
+                    layer[mate] = layer[left] + 1
+                    queue.append(mate)
+        if not found:
+            return size
+        
+        for left, right in match_left.items():
+            if right is None and augment(left):
+                size += 1
+
+
+def can_tile(board: Board, graph: Optional[Dict[int, Sequence[int]]] = None) -> bool:
+    """
+    Check whether dominoes can cover the empty positions of a board.
+    
+    Args:
+        board: The board to check
+        graph: Dictionary mapping each empty position of one checkerboard
+            colour to the empty neighbours it may share a domino with;
+            defaults to all of its empty neighbours
+            
+    Returns:
+        True if the empty positions have a perfect matching, False otherwise
+    """
+    state = board.state
+    empty = [key for key in board._ordered_keys if key not in state]
+    if graph is None:
+        graph = {
+            key: [other for other in board.adj[key] if other not in state]
+            for key in empty
+            if not ((key >> KEY_COL_BITS) + (key & KEY_COL_MASK)) & 1
+        }
+    return 2 * len(graph) == len(empty) and 2 * max_matching(graph) == len(empty)
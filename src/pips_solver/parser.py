@@ -1,8 +1,41 @@
 """Parser for loading puzzles from JSON format."""
 
-import json
-from typing import Dict, Any, List
-from .structures import Board, Region, Constraint, ConstraintType, Position
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from .structures import Board, Region, Constraint, ConstraintType, intern_position
+
+try:
+    # Optional faster parser; its decode errors subclass json.JSONDecodeError
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+
+# Map string to ConstraintType; both the symbol and the word spellings of
+# each constraint are accepted
+_TYPE_MAP: Dict[str, ConstraintType] = {
+    "=": ConstraintType.EQUAL,
+    "equal": ConstraintType.EQUAL,
+    "!=": ConstraintType.NOT_EQUAL,
+    "not_equal": ConstraintType.NOT_EQUAL,
+    "notequal": ConstraintType.NOT_EQUAL,
+    ">": ConstraintType.GREATER_THAN,
+    "greater": ConstraintType.GREATER_THAN,
+    "greater_than": ConstraintType.GREATER_THAN,
+    "<": ConstraintType.LESS_THAN,
+    "less": ConstraintType.LESS_THAN,
+    "less_than": ConstraintType.LESS_THAN,
+    "sum": ConstraintType.SUM,
+    "number": ConstraintType.SUM,
+    "none": ConstraintType.NONE,
+    "empty": ConstraintType.NONE,
+}
+
+
+@lru_cache(maxsize=None, typed=True)
+def _make_constraint(type_str: str, value: Optional[int]) -> Constraint:
+    """Build a Constraint; regions with the same definition share one."""
+    return Constraint(_TYPE_MAP.get(type_str, ConstraintType.NONE), value)
 
 
 def parse_constraint(constraint_data: Dict[str, Any]) -> Constraint:
@@ -18,18 +51,11 @@ def parse_constraint(constraint_data: Dict[str, Any]) -> Constraint:
     constraint_type_str = constraint_data.get("type", "none")
     value = constraint_data.get("value")
     
-    # Map string to ConstraintType
-    type_map = {
-        "=": ConstraintType.EQUAL,
-        "!=": ConstraintType.NOT_EQUAL,
-        ">": ConstraintType.GREATER_THAN,
-        "<": ConstraintType.LESS_THAN,
-        "sum": ConstraintType.SUM,
-        "none": ConstraintType.NONE,
-    }
-    
-    constraint_type = type_map.get(constraint_type_str, ConstraintType.NONE)
-    return Constraint(constraint_type, value)
+    try:
+        return _make_constraint(constraint_type_str, value)
+    except TypeError:
+        # Unhashable values (malformed input) cannot be cached
+        return Constraint(_TYPE_MAP.get(constraint_type_str, ConstraintType.NONE), value)
 
 
 def parse_region(region_data: Dict[str, Any]) -> Region:
@@ -42,12 +68,7 @@ def parse_region(region_data: Dict[str, Any]) -> Region:
     Returns:
         Region object
     """
-    positions = set()
-    for pos_data in region_data["positions"]:
-        row = pos_data["row"]
-        col = pos_data["col"]
-        positions.add(Position(row, col))
-    
+    positions = {intern_position(pos_data["row"], pos_data["col"]) for pos_data in region_data["positions"]}
     constraint = parse_constraint(region_data.get("constraint", {"type": "none"}))
     return Region(positions, constraint)
 
@@ -97,33 +118,9 @@ def load_puzzle(file_path: str) -> Board:
         "regions": [...]
     }
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    
-    rows = data.get("rows")
-    cols = data.get("cols")
-    regions = [parse_region(region_data) for region_data in data.get("regions", [])]
-    
-    # Parse valid_positions if provided
-    valid_positions = None
-    if "valid_positions" in data:
-        valid_positions = set()
-        for pos_data in data["valid_positions"]:
-            row = pos_data["row"]
-            col = pos_data["col"]
-            valid_positions.add(Position(row, col))
-    
-    # Parse available dominoes if provided
-    available_dominoes = None
-    if "dominoes" in data:
-        available_dominoes = []
-        for domino_data in data["dominoes"]:
-            # Each domino is a list/tuple of two integers
-            dots1, dots2 = domino_data[0], domino_data[1]
-            # Normalize to always have smaller value first
-            available_dominoes.append((min(dots1, dots2), max(dots1, dots2)))
-    
-    return Board(rows, cols, regions, valid_positions, available_dominoes)
+    with open(file_path, 'rb') as f:
+        data = _loads(f.read())
+    return board_from_data(data)
 
 
 def load_puzzle_from_string(json_str: str) -> Board:
@@ -136,7 +133,19 @@ def load_puzzle_from_string(json_str: str) -> Board:
     Returns:
         Board object
     """
-    data = json.loads(json_str)
+    return board_from_data(_loads(json_str))
+
+
+def board_from_data(data: Dict[str, Any]) -> Board:
+    """
+    Build a board from decoded puzzle JSON data.
+    
+    Args:
+        data: Dictionary in one of the formats accepted by load_puzzle
+        
+    Returns:
+        Board object
+    """
     rows = data.get("rows")
     cols = data.get("cols")
     regions = [parse_region(region_data) for region_data in data.get("regions", [])]
@@ -144,20 +153,15 @@ def load_puzzle_from_string(json_str: str) -> Board:
     # Parse valid_positions if provided
     valid_positions = None
     if "valid_positions" in data:
-        valid_positions = set()
-        for pos_data in data["valid_positions"]:
-            row = pos_data["row"]
-            col = pos_data["col"]
-            valid_positions.add(Position(row, col))
+        valid_positions = {intern_position(pos_data["row"], pos_data["col"]) for pos_data in data["valid_positions"]}
     
-    # Parse available dominoes if provided
+    # Parse available dominoes if provided; each is a list/tuple of two
+    # integers, normalized to have the smaller value first
     available_dominoes = None
     if "dominoes" in data:
-        available_dominoes = []
-        for domino_data in data["dominoes"]:
-            # Each domino is a list/tuple of two integers
-            dots1, dots2 = domino_data[0], domino_data[1]
-            # Normalize to always have smaller value first
-            available_dominoes.append((min(dots1, dots2), max(dots1, dots2)))
+        available_dominoes = [
+            (dots1, dots2) if dots1 <= dots2 else (dots2, dots1)
+            for dots1, dots2 in (domino_data[:2] for domino_data in data["dominoes"])
+        ]
     
     return Board(rows, cols, regions, valid_positions, available_dominoes)
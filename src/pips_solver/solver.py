@@ -1,12 +1,89 @@
 """Backtracking solver for pips puzzles."""
 
-from typing import List, Optional, Set, Tuple
-from .structures import Board, Domino, Position
+import os
+import random
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from . import cache
+from .ac3 import ac3
+from .codegen import build_pair_checks
+from .matching import can_tile
+from .structures import KEY_COL_BITS, KEY_COL_MASK, MAX_DOTS, Board, Domino, pack
+from .symmetry import board_symmetries
+
+
+# A move is (key1, key2, domino index, dots1, dots2)
+Move = Tuple[int, int, int, int, int]
+
+# The standard set of dominoes, 0-0 through 6-6, used when a board lists none
+DEFAULT_DOMINOES: Tuple[Tuple[int, int], ...] = tuple(
+    (i, j) for i in range(MAX_DOTS + 1) for j in range(i, MAX_DOTS + 1)
+)
+
+# Set in worker processes by _init_worker; tells running searches to give up
+_stop_event = None
+
+
+def _init_worker(stop_event) -> None:
+    """Store the shared stop event in a worker process."""
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _solve_from(board: Board, used_mask: int, prefix: List[Move],
+                seed: Optional[int] = None) -> Optional[List[Move]]:
+    """
+    Search the subtree that starts with a given sequence of moves.
+    
+    Runs in a worker process on its own copy of the board.
+    
+    Args:
+        board: The board to solve
+        used_mask: Bits of the dominoes already placed on the board
+        prefix: The placements to make before searching
+        seed: If given, the order dominoes are tried in is shuffled with it
+        
+    Returns:
+        The placements of a solution, prefix included, or None if the
+        subtree has no solution or the search was stopped
+    """
+    solver = PipsSolver(board)
+    solver._stop = _stop_event
+    solver.used_mask = used_mask
+    solver._pip_count = solver._count_pips()
+    if seed is not None:
+        random.Random(seed).shuffle(solver._candidates)
+    for move in prefix:
+        if not solver._apply_move(move):
+            return None
+    if not solver._search():
+        return None
+    return [
+        (key1, key2, k, board.state[key1], board.state[key2])
+        for key1, key2, k in solver._placements
+    ]
 
 
 class PipsSolver:
     """Solver for pips puzzles using backtracking algorithm."""
     
+    # Maximum number of dead partial states remembered by the search
+    DEAD_STATE_LIMIT = 100_000
+    
+    # Boards with more valid positions than this are solved by solve_parallel;
+    # None always solves in the calling process
+    parallel_threshold: Optional[int] = None
+    
+    # The search switches to placement checks generated for the board once
+    # it has made about this many generic placement probes per ordered pair
+    # of adjacent positions, so easy puzzles never pay for generating them
+    CODEGEN_PROBES_PER_PAIR = 25
+    
+    # Boards with at most this many valid positions are filled in row-major
+    # order; ranking their positions costs more than it saves
+    MRV_MIN_POSITIONS = 12
+    
     def __init__(self, board: Board):
         """
         Initialize the solver with a board.
@@ -16,8 +93,56 @@ class PipsSolver:
         """
         self.board = board
         self.all_dominoes = self._generate_dominoes()
-        self.used_dominoes = set()
-        
+        # Distinct (dots1, dots2) orientations of each domino; doubles have one
+        self._orientations = [
+            ((dots1, dots2),) if dots1 == dots2 else ((dots1, dots2), (dots2, dots1))
+            for dots1, dots2 in self.all_dominoes
+        ]
+        # Bit k is set while all_dominoes[k] is placed on the board
+        self.used_mask = 0
+        # For each domino, the bits of identical dominoes listed before it.
+        # Only the first unused copy of a duplicated tile is tried.
+        self._earlier_copies = [
+            sum(1 << j for j in range(k) if self.all_dominoes[j] == domino)
+            for k, domino in enumerate(self.all_dominoes)
+        ]
+        # One row per domino orientation, so the search loops over a single
+        # flat table: (domino index, domino bit, bits of earlier identical
+        # dominoes, dots1, dots2)
+        self._candidates: List[Tuple[int, int, int, int, int]] = [
+            (k, 1 << k, self._earlier_copies[k], dots1, dots2)
+            for k, orientations in enumerate(self._orientations)
+            for dots1, dots2 in orientations
+        ]
+        # Drop the values no solution can use from the board's cell domains;
+        # every placement check below reads them
+        board.cell_domain = ac3(board, self.all_dominoes)
+        # Packed key -> (neighbour key, check of (dots1, dots2)) for every
+        # placement over that pair; generic until the codegen kicks in
+        self._pair_checks = {
+            key1: tuple((key2, partial(board.fits_keys, key1, key2)) for key2 in neighbors)
+            for key1, neighbors in board.adj.items()
+        }
+        # Generic probes left before the checks are generated, or None once
+        # they have been
+        self._codegen_budget: Optional[int] = self.CODEGEN_PROBES_PER_PAIR * sum(
+            len(neighbors) for neighbors in board.adj.values()
+        )
+        # _pip_count[d] is the number of halves with d dots on unused dominoes
+        self._pip_count = self._count_pips()
+        # (key1, key2, domino index) of each placement of the current search
+        self._placements: List[Tuple[int, int, int]] = []
+        # Event that aborts the search once set (used by parallel workers)
+        self._stop = None
+        # Whether to rank the empty positions before each placement. Until
+        # the search first backtracks, row-major order is as good and cheaper.
+        self._rank_positions = False
+        # Partial states known to have no solution, least recently used first
+        self._dead: "OrderedDict[Tuple[int, frozenset], None]" = OrderedDict()
+        # Key maps of the rotations and reflections that leave the puzzle
+        # unchanged; the image of a dead state under one is dead as well
+        self._symmetries = board_symmetries(board)
+    
     def _generate_dominoes(self) -> List[Tuple[int, int]]:
         """
         Generate the list of available domino combinations.
@@ -32,33 +157,96 @@ class PipsSolver:
             # Use the dominoes specified by the puzzle
             return self.board.available_dominoes[:]
         else:
-            # Generate all standard dominoes (0-0 through 6-6)
-            dominoes = []
-            for i in range(7):
-                for j in range(i, 7):
-                    dominoes.append((i, j))
-            return dominoes
+            # All standard dominoes (0-0 through 6-6), built once at import
+            return list(DEFAULT_DOMINOES)
     
-    def _get_adjacent_positions(self, pos: Position) -> List[Position]:
+    def _count_pips(self) -> List[int]:
         """
-        Get positions adjacent to the given position (horizontal and vertical).
+        Count the dot values on the dominoes not marked in used_mask.
+        
+        Returns:
+            List whose entry d is the number of unused domino halves with d dots
+        """
+        counts = [0] * (max((max(domino) for domino in self.all_dominoes), default=-1) + 1)
+        for k, (dots1, dots2) in enumerate(self.all_dominoes):
+            if not self.used_mask >> k & 1:
+                counts[dots1] += 1
+                counts[dots2] += 1
+        return counts
+    
+    def _count_placements(self, key1: int, limit: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Count the legal domino placements covering an empty position.
         
         Args:
-            pos: The position to get adjacent positions for
+            key1: Packed key of the empty position
+            limit: Stop counting once the result cannot be lower than this
             
         Returns:
-            List of adjacent valid positions
-        """
-        adjacent = []
-        # Right
-        right = Position(pos.row, pos.col + 1)
-        if self.board.is_valid_position(right):
-            adjacent.append(right)
-        # Down
-        down = Position(pos.row + 1, pos.col)
-        if self.board.is_valid_position(down):
-            adjacent.append(down)
-        return adjacent
+            Tuple of (number of neighbours with a legal placement, number of
+            legal placements); both parts only grow while counting
+        """
+        board = self.board
+        state = board.state
+        domains = board.cell_domain
+        used = self.used_mask
+        mask1 = domains[key1]
+        partners = count = 0
+        for key2, fits in self._pair_checks[key1]:
+            if key2 in state:
+                continue
+            mask2 = domains[key2]
+            before = count
+            for _, bit, earlier, dots1, dots2 in self._candidates:
+                if used & bit or earlier & ~used:
+                    continue
+                if mask1 >> dots1 & mask2 >> dots2 & 1 and fits(dots1, dots2):
+                    count += 1
+                    if (partners, count) >= limit:
+                        return limit
+            if count > before:
+                partners += 1
+                if (partners, count) >= limit:
+                    return limit
+        return partners, count
+    
+    def _pick_next_position(self) -> Optional[int]:
+        """
+        Pick the empty position with the fewest legal domino placements.
+        
+        Positions are ranked by how many neighbours they can still pair with,
+        then by their total number of legal placements. Ties go to the first
+        such position in row-major order, and a position with no legal
+        placement is returned immediately so the search fails fast; the
+        neighbours of the last placement are checked for that first. Small
+        boards, and searches that have not backtracked yet, take the first
+        empty position in row-major order instead.
+        
+        Returns:
+            Packed key of the chosen position, or None if the board is full
+        """
+        board = self.board
+        if not self._rank_positions or len(board.valid_positions) <= self.MRV_MIN_POSITIONS:
+            return board.get_first_empty_key()
+        
+        # Forward check: the last placement is what can leave a neighbour
+        # without any legal placement, so look there before a full scan
+        if self._placements:
+            state = board.state
+            last1, last2, _ = self._placements[-1]
+            for key in board.adj[last1] + board.adj[last2]:
+                if key not in state and self._count_placements(key, (0, 1)) == (0, 0):
+                    return key
+        
+        best_key = None
+        best_count = (1 << 30, 0)
+        for key in board.get_empty_keys():
+            count = self._count_placements(key, best_count)
+            if best_key is None or count < best_count:
+                best_key, best_count = key, count
+                if count == (0, 0):
+                    break
+        return best_key
     
     def solve(self) -> bool:
         """
@@ -67,46 +255,418 @@ class PipsSolver:
         Returns:
             True if a solution is found, False otherwise
         """
-        # If board is complete, we found a solution
+        # Reuse the solution of a puzzle solved before, if caching is on
+        cache_key = None
+        if cache.enabled():
+            cache_key = cache.canonical_key(self.board)
+            if self._apply_cached(cache.get(cache_key)):
+                return True
+        
+        if not self._can_cover() or not can_tile(self.board, self._legal_pairs()):
+            return False
+        
+        if self.parallel_threshold is not None and len(self.board.valid_positions) > self.parallel_threshold:
+            solved = self.solve_parallel()
+        else:
+            # The search works on packed keys only; Domino objects are built
+            # once for the placements of the solution
+            self._placements = []
+            solved = self._search()
+            if solved:
+                self._record_placements()
+        
+        if solved and cache_key is not None:
+            state = self.board.state
+            cache.put(cache_key, [
+                (key1, key2, state[key1], state[key2]) for key1, key2, _ in self._placements
+            ])
+        return solved
+    
+    def _can_cover(self) -> bool:
+        """
+        Check the counts that any tiling of the empty positions must meet.
+        
+        Every domino covers two positions, one of each colour of a
+        checkerboard, so the empty positions must split evenly between the
+        colours and there must be an unused domino for every two of them.
+        
+        Returns:
+            False if the empty positions cannot be covered, True otherwise
+        """
+        state = self.board.state
+        empty = [key for key in self.board._ordered_keys if key not in state]
+        # Positions with an even row + column, i.e. one checkerboard colour
+        even = sum(1 for key in empty if not ((key >> KEY_COL_BITS) + (key & KEY_COL_MASK)) & 1)
+        unused = len(self.all_dominoes) - bin(self.used_mask).count("1")
+        return 2 * even == len(empty) and len(empty) <= 2 * unused
+    
+    def _legal_pairs(self) -> Dict[int, List[int]]:
+        """
+        Find the pairs of empty positions some unused domino can cover.
+        
+        Returns:
+            Dictionary mapping each empty position with an even row + column
+            to the neighbours it has a legal placement with
+        """
+        board = self.board
+        state = board.state
+        domains = board.cell_domain
+        used = self.used_mask
+        pairs = {}
+        for key1 in board._ordered_keys:
+            if key1 in state or ((key1 >> KEY_COL_BITS) + (key1 & KEY_COL_MASK)) & 1:
+                continue
+            pairs[key1] = [
+                key2 for key2, fits in self._pair_checks[key1]
+                if key2 not in state and any(
+                    domains[key1] >> d1 & domains[key2] >> d2 & 1 and fits(d1, d2)
+                    for _, bit, earlier, d1, d2 in self._candidates
+                    if not (used & bit or earlier & ~used)
+                )
+            ]
+        return pairs
+    
+    def _apply_cached(self, placements: Optional[List[cache.CachedPlacement]]) -> bool:
+        """
+        Make the placements of a cached solution if they complete the board.
+        
+        Each placement is checked like a search move, so a stale or damaged
+        cache entry is undone and ignored.
+        
+        Args:
+            placements: The cached placements, or None on a cache miss
+            
+        Returns:
+            True if the board was completed, False otherwise
+        """
+        if placements is None:
+            return False
+        board = self.board
+        self._placements = []
+        moves: List[Move] = []
+        try:
+            for row1, col1, row2, col2, dots1, dots2 in placements:
+                key1, key2 = pack(row1, col1), pack(row2, col2)
+                tile = (min(dots1, dots2), max(dots1, dots2))
+                # The first unused copy of the tile, as the search would take it
+                k = next((
+                    k for k, domino in enumerate(self.all_dominoes)
+                    if (min(domino), max(domino)) == tile and not self.used_mask >> k & 1
+                ), None)
+                move = (key1, key2, k, dots1, dots2)
+                if k is None or key2 not in board.adj.get(key1, ()) or not self._apply_move(move):
+                    break
+                moves.append(move)
+            else:
+                if board.is_complete():
+                    self._record_placements()
+                    return True
+        except (TypeError, ValueError):
+            pass
+        for move in reversed(moves):
+            self._undo_move(move)
+        return False
+    
+    def _record_placements(self) -> None:
+        """Append a Domino to the board for each placement of the search."""
+        board = self.board
+        for key1, key2, _ in self._placements:
+            board.placed_dominoes.append(Domino(
+                board.positions_by_key[key1], board.positions_by_key[key2],
+                board.state[key1], board.state[key2]
+            ))
+    
+    def _next_moves(self) -> List[Move]:
+        """
+        List the legal placements on the most constrained empty position.
+        
+        Returns:
+            The moves the search would try next, which partition its subtree
+        """
+        board = self.board
+        key1 = self._pick_next_position()
+        if key1 is None:
+            return []
+        used = self.used_mask
+        mask1 = board.cell_domain[key1]
+        moves = []
+        for key2, fits in self._pair_checks[key1]:
+            if key2 in board.state:
+                continue
+            mask2 = board.cell_domain[key2]
+            for k, bit, earlier, dots1, dots2 in self._candidates:
+                if used & bit or earlier & ~used:
+                    continue
+                if mask1 >> dots1 & mask2 >> dots2 & 1 and fits(dots1, dots2):
+                    moves.append((key1, key2, k, dots1, dots2))
+        return moves
+    
+    def _apply_move(self, move: Move) -> bool:
+        """Place a move on the board and mark its domino as used."""
+        key1, key2, k, dots1, dots2 = move
+        if not self.board.place_keys(key1, key2, dots1, dots2):
+            return False
+        self.used_mask |= 1 << k
+        self._pip_count[dots1] -= 1
+        self._pip_count[dots2] -= 1
+        self._placements.append((key1, key2, k))
+        return True
+    
+    def _undo_move(self, move: Move) -> None:
+        """Undo the most recent move made by _apply_move."""
+        key1, key2, k, dots1, dots2 = move
+        self._placements.pop()
+        self._pip_count[dots1] += 1
+        self._pip_count[dots2] += 1
+        self.used_mask ^= 1 << k
+        self.board.remove_keys(key1, key2)
+    
+    def _split(self, depth: int, prefix: List[Move], prefixes: List[List[Move]]) -> None:
+        """
+        Collect the move sequences reaching the search tree's nodes at a depth.
+        
+        Branches that end earlier in a dead end are dropped; a branch that
+        completes the board is kept as it is.
+        
+        Args:
+            depth: Remaining number of moves to expand
+            prefix: Moves made so far
+            prefixes: List the move sequences are appended to, in search order
+        """
+        board = self.board
+        if depth == 0 or board.is_complete():
+            prefixes.append(prefix[:])
+            return
+        if not board.can_complete(self._pip_count):
+            return
+        for move in self._next_moves():
+            self._apply_move(move)
+            prefix.append(move)
+            self._split(depth - 1, prefix, prefixes)
+            prefix.pop()
+            self._undo_move(move)
+    
+    def solve_parallel(self, workers: Optional[int] = None, split_depth: int = 2) -> bool:
+        """
+        Solve the puzzle by splitting the search tree into independent
+        subtrees searched by a pool of processes.
+        
+        The first split_depth levels of the search are expanded here, and
+        each resulting node is one job; with many more jobs than workers the
+        pool keeps every process busy. The first solution found is applied
+        to the board and the remaining searches are stopped. Worth it only
+        for hard puzzles; starting the processes costs far more than solving
+        a typical puzzle.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            split_depth: Number of moves expanded before handing out jobs
+            
+        Returns:
+            True if a solution is found, False otherwise
+        """
+        self._placements = []
         if self.board.is_complete():
             return True
+        prefixes: List[List[Move]] = []
+        self._split(max(split_depth, 1), [], prefixes)
+        if not prefixes:
+            return False
         
-        # Get the first empty position
-        empty_positions = self.board.get_empty_positions()
-        if not empty_positions:
+        # Jobs are queued in search order, so the subtrees the sequential
+        # search would try first are picked up first
+        solution = self._run_jobs(
+            workers, [(self.board, self.used_mask, prefix) for prefix in prefixes], False
+        )
+        return self._apply_solution(solution)
+    
+    def solve_portfolio(self, workers: Optional[int] = None, seed: int = 0) -> bool:
+        """
+        Solve the puzzle by racing whole searches that try dominoes in
+        different orders, one per process.
+        
+        The first worker keeps the usual order and the others shuffle it
+        with their own seed. Search times vary a lot with that order on hard
+        puzzles, so the fastest of several orders tends to beat splitting one
+        search. Every worker searches the whole tree: the first to finish
+        decides, whether it found a solution or proved there is none.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            seed: Base seed of the shuffled orders
+            
+        Returns:
+            True if a solution is found, False otherwise
+        """
+        self._placements = []
+        if self.board.is_complete():
+            return True
+        
+        count = workers if workers is not None else os.cpu_count() or 1
+        jobs = [
+            (self.board, self.used_mask, [], None if i == 0 else seed + i)
+            for i in range(count)
+        ]
+        return self._apply_solution(self._run_jobs(workers, jobs, True))
+    
+    def _run_jobs(self, workers: Optional[int], jobs: Sequence[tuple],
+                  first_decides: bool) -> Optional[List[Move]]:
+        """
+        Run _solve_from jobs on a pool of processes until one finds a solution.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            jobs: Arguments of each _solve_from call
+            first_decides: Whether the first job to finish settles the search
+                even if it found no solution
+                
+        Returns:
+            The placements of the solution found, or None
+        """
+        # Imported here: the process machinery costs more to import than
+        # solving a typical puzzle, and only the parallel solves need it
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        
+        solution = None
+        stop_event = multiprocessing.Event()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(stop_event,)
+        ) as executor:
+            pending = {executor.submit(_solve_from, *job) for job in jobs}
+            finished = False
+            while pending and not finished:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result() is not None:
+                        solution = future.result()
+                        break
+                finished = solution is not None or first_decides
+            # Drop queued jobs and make running ones return early
+            stop_event.set()
+            for future in pending:
+                future.cancel()
+        return solution
+    
+    def _apply_solution(self, solution: Optional[List[Move]]) -> bool:
+        """
+        Make the moves of a solution found by a worker on this solver's board.
+        
+        Args:
+            solution: The placements of the solution, or None
+            
+        Returns:
+            True if a solution was applied, False otherwise
+        """
+        if solution is None:
             return False
+        for move in solution:
+            self._apply_move(move)
+        self._record_placements()
+        return True
+    
+    def _search(self) -> bool:
+        """
+        Recursively place dominoes on the most constrained empty position.
         
-        pos1 = empty_positions[0]
+        Returns:
+            True if the board was completed, False otherwise
+        """
+        board = self.board
         
-        # Try placing a domino starting from this position
-        for pos2 in self._get_adjacent_positions(pos1):
+        # If board is complete, we found a solution
+        if board.is_complete():
+            return True
+        
+        # Give up once another worker has found a solution
+        if self._stop is not None and self._stop.is_set():
+            return False
+        
+        # Forward check: every region must still be completable from the dot
+        # values left on the unplaced dominoes
+        pips = self._pip_count
+        if not board.can_complete(pips):
+            return False
+        
+        # The empty positions must still have a tiling; checked every other
+        # placement, as one placement rarely breaks it
+        if not len(self._placements) & 1 and not can_tile(board):
+            return False
+        
+        # Skip partial states already searched through another placement order
+        dead = self._dead
+        state_key = (self.used_mask, frozenset(board.state.items()))
+        if state_key in dead:
+            dead.move_to_end(state_key)
+            return False
+        
+        # A search this long is worth placement checks specialized to the
+        # board; picking the next position probes about every candidate on
+        # every empty position
+        if self._codegen_budget is not None:
+            self._codegen_budget -= (len(board.valid_positions) - len(board.state)) * len(self._candidates)
+            if self._codegen_budget <= 0:
+                self._pair_checks = build_pair_checks(board)
+                self._codegen_budget = None
+        
+        # Get the most constrained empty position
+        key1 = self._pick_next_position()
+        if key1 is None:
+            return False
+        
+        # Try placing a domino covering this position. The search restores
+        # used_mask before each next candidate, so a local copy stays valid.
+        state = board.state
+        commit = board.commit_keys
+        remove = board.remove_keys
+        placements = self._placements
+        used = self.used_mask
+        mask1 = board.cell_domain[key1]
+        for key2, fits in self._pair_checks[key1]:
             # Skip if the second position is already occupied
-            if self.board.is_position_occupied(pos2):
+            if key2 in state:
                 continue
+            mask2 = board.cell_domain[key2]
             
-            # Try each available domino
-            for domino_tuple in self.all_dominoes:
-                if domino_tuple in self.used_dominoes:
+            # Try each orientation of each available domino
+            for k, bit, earlier, d1, d2 in self._candidates:
+                # Skip dominoes in use, and later copies of an unused duplicate
+                if used & bit or earlier & ~used:
                     continue
+                
+                # Rule out values outside the cell domains before any
+                # region is checked
+                if not (mask1 >> d1 & mask2 >> d2 & 1):
+                    continue
+                
+                # Try to place the domino
+                if fits(d1, d2):
+                    commit(key1, key2, d1, d2)
+                    
+                    # Mark domino as used
+                    self.used_mask = used | bit
+                    pips[d1] -= 1
+                    pips[d2] -= 1
+                    placements.append((key1, key2, k))
                     
-                dots1, dots2 = domino_tuple
-                # Try both orientations
-                for d1, d2 in [(dots1, dots2), (dots2, dots1)]:
-                    domino = Domino(pos1, pos2, d1, d2)
+                    # Recursively solve
+                    if self._search():
+                        return True
                     
-                    # Try to place the domino
-                    if self.board.place_domino(domino):
-                        # Mark domino as used
-                        self.used_dominoes.add(domino_tuple)
-                        
-                        # Recursively solve
-                        if self.solve():
-                            return True
-                        
-                        # Backtrack
-                        self.used_dominoes.remove(domino_tuple)
-                        self.board.remove_domino(domino)
+                    # Backtrack
+                    placements.pop()
+                    pips[d1] += 1
+                    pips[d2] += 1
+                    self.used_mask = used
+                    remove(key1, key2)
         
+        # A dead end: from here on, fail fast on the most constrained position
+        self._rank_positions = True
+        dead[state_key] = None
+        for mapping in self._symmetries:
+            dead[state_key[0], frozenset((mapping[key], dots) for key, dots in state_key[1])] = None
+        while len(dead) > self.DEAD_STATE_LIMIT:
+            dead.popitem(last=False)
         return False
     
     def get_solution(self) -> Optional[List[Domino]]:
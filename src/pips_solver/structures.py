@@ -2,7 +2,21 @@
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, List, Set, Tuple
+from functools import lru_cache
+from typing import AbstractSet, Optional, List, Set, Tuple, Dict, NamedTuple
+
+
+# Positions are packed into a single int key (row << 8 | col) for the solver's
+# internal dicts and sets. Columns must fit in 8 bits, and the last column is
+# left unused so that key +/- 1 never wraps into a neighbouring row.
+KEY_COL_BITS = 8
+KEY_COL_MASK = (1 << KEY_COL_BITS) - 1
+KEY_DOWN = 1 << KEY_COL_BITS  # Key offset of the position one row down
+
+
+def pack(row: int, col: int) -> int:
+    """Pack a row and column into a single int key."""
+    return (row << KEY_COL_BITS) | col
 
 
 class ConstraintType(Enum):
@@ -15,8 +29,7 @@ class ConstraintType(Enum):
     NONE = "none"
 
 
-@dataclass
-class Constraint:
+class Constraint(NamedTuple):
     """Represents a constraint on a region."""
     constraint_type: ConstraintType
     value: Optional[int] = None  # Used for >, <, and sum constraints
@@ -32,23 +45,38 @@ class Constraint:
             return self.constraint_type.value
 
 
-@dataclass
-class Position:
-    """Represents a position on the board."""
+class _PositionFields(NamedTuple):
     row: int
     col: int
+
+
+class Position(_PositionFields):
+    """
+    Represents a position on the board.
     
-    def __hash__(self) -> int:
-        return hash((self.row, self.col))
+    Positions are interned: building one returns the shared object for its
+    coordinates, so set and dict lookups between positions mostly succeed on
+    the identity check. Unpickling, copying, _make and _replace go through
+    the same path. Only the most recently used coordinates are kept, so
+    equality, not identity, is what positions guarantee.
+    """
+    __slots__ = ()
     
-    def __eq__(self, other) -> bool:
-        if not isinstance(other, Position):
-            return False
-        return self.row == other.row and self.col == other.col
+    def __new__(cls, row: int, col: int) -> "Position":
+        return _interned_position(cls, row, col)
+    
+    @classmethod
+    def _make(cls, iterable) -> "Position":
+        row, col = iterable
+        return _interned_position(cls, row, col)
+    
+    @property
+    def key(self) -> int:
+        """Packed int key of this position, as produced by pack()."""
+        return (self.row << KEY_COL_BITS) | self.col
 
 
-@dataclass
-class Domino:
+class Domino(NamedTuple):
     """Represents a domino piece with two positions and their dot values."""
     pos1: Position
     pos2: Position
@@ -64,51 +92,283 @@ class Domino:
         return (self.dots1, self.dots2)
 
 
+# Most positions interned at once; far more than the cells of any puzzle
+INTERNED_POSITIONS = 4096
+
+
+@lru_cache(maxsize=INTERNED_POSITIONS, typed=True)
+def _interned_position(cls: type, row: int, col: int) -> Position:
+    """Build the one Position object kept for a row and column."""
+    return tuple.__new__(cls, (row, col))
+
+
+def intern_position(row: int, col: int) -> Position:
+    """
+    Get the shared Position object for a row and column.
+    
+    Equivalent to Position(row, col), which is interned as well.
+    """
+    return _interned_position(Position, row, col)
+
+
+def unpack(key: int) -> Position:
+    """Unpack an int key produced by pack() back into a Position."""
+    return intern_position(key >> KEY_COL_BITS, key & KEY_COL_MASK)
+
+
+# Largest dot value on a standard domino set
+MAX_DOTS = 6
+
+
+# Checks of a region's constraint from its running aggregates: the sum of its
+# dots, its number of filled positions, the bitmask of dot values present, the
+# constraint value and the bitmask of the sums the empty positions can still
+# add (bit s set if they can add exactly s). A partial region fails as soon as
+# no completion can satisfy the constraint; for a full region reach is 1 (only
+# 0 can be added) and the checks are exact.
+
+
+def _check_none(total: int, filled: int, seen: int, value: Optional[int], reach: int) -> bool:
+    return True
+
+
+def _check_equal(total: int, filled: int, seen: int, value: Optional[int], reach: int) -> bool:
+    return seen & (seen - 1) == 0  # A single distinct value
+
+
+def _check_not_equal(total: int, filled: int, seen: int, value: Optional[int], reach: int) -> bool:
+    return bin(seen).count("1") == filled  # No value repeated
+
+
+def _check_greater_than(total: int, filled: int, seen: int, value: Optional[int], reach: int) -> bool:
+    return seen == 0 or (seen & -seen).bit_length() - 1 > value  # Minimum value
+
+
+def _check_less_than(total: int, filled: int, seen: int, value: Optional[int], reach: int) -> bool:
+    return seen.bit_length() - 1 < value  # Maximum value
+
+
+def _check_sum(total: int, filled: int, seen: int, value: Optional[int], reach: int) -> bool:
+    return total <= value and reach >> (value - total) & 1 == 1  # Remainder can be added
+
+
+# Checks for regions whose constraint value is not an int (malformed input,
+# such as 7.0 or a missing value). Partial regions always pass; a full region
+# (reach is 1) is compared with the value as it is.
+
+
+def _check_full_greater_than(total: int, filled: int, seen: int, value, reach: int) -> bool:
+    return reach != 1 or seen == 0 or (seen & -seen).bit_length() - 1 > value
+
+
+def _check_full_less_than(total: int, filled: int, seen: int, value, reach: int) -> bool:
+    return reach != 1 or seen.bit_length() - 1 < value
+
+
+def _check_full_sum(total: int, filled: int, seen: int, value, reach: int) -> bool:
+    return reach != 1 or total == value
+
+
+# Checks that a partial region can still be completed from the dot values left
+# on the unplaced dominoes: counts[d] is the number of unplaced domino halves
+# with d dots and open_cells the number of empty positions in the region.
+
+
+def _complete_none(total: int, seen: int, open_cells: int, value: Optional[int],
+                   counts: List[int]) -> bool:
+    return True
+
+
+def _complete_equal(total: int, seen: int, open_cells: int, value: Optional[int],
+                    counts: List[int]) -> bool:
+    if seen:
+        return counts[seen.bit_length() - 1] >= open_cells  # More of the value present
+    return max(counts, default=0) >= open_cells
+
+
+def _complete_not_equal(total: int, seen: int, open_cells: int, value: Optional[int],
+                        counts: List[int]) -> bool:
+    fresh = sum(1 for dots, count in enumerate(counts) if count and not seen >> dots & 1)
+    return fresh >= open_cells
+
+
+def _complete_greater_than(total: int, seen: int, open_cells: int, value: Optional[int],
+                           counts: List[int]) -> bool:
+    return sum(counts[max(value + 1, 0):]) >= open_cells
+
+
+def _complete_less_than(total: int, seen: int, open_cells: int, value: Optional[int],
+                        counts: List[int]) -> bool:
+    return sum(counts[:max(value, 0)]) >= open_cells
+
+
+def _complete_sum(total: int, seen: int, open_cells: int, value: Optional[int],
+                  counts: List[int]) -> bool:
+    # The remainder must lie between the sums of the smallest and of the
+    # largest open_cells values left
+    lowest = highest = 0
+    left = open_cells
+    for dots, count in enumerate(counts):
+        take = count if count < left else left
+        lowest += take * dots
+        left -= take
+        if not left:
+            break
+    else:
+        return False  # Fewer halves left than empty positions
+    left = open_cells
+    for dots in range(len(counts) - 1, -1, -1):
+        take = counts[dots] if counts[dots] < left else left
+        highest += take * dots
+        left -= take
+        if not left:
+            break
+    return lowest <= value - total <= highest
+
+
+# Order in which constraint types are checked: types most likely to reject a
+# placement come first. NONE regions never reject and are not checked at all.
+_SELECTIVITY_RANK = {
+    ConstraintType.EQUAL: 0,
+    ConstraintType.NOT_EQUAL: 1,
+    ConstraintType.SUM: 2,
+    ConstraintType.GREATER_THAN: 3,
+    ConstraintType.LESS_THAN: 3,
+    ConstraintType.NONE: 9,
+}
+
+
+def selectivity_rank(region: "Region") -> Tuple[int, int]:
+    """Sort key placing tighter constraints and smaller regions first."""
+    return (_SELECTIVITY_RANK[region.constraint.constraint_type], len(region.positions))
+
+
+_CHECKS = {
+    ConstraintType.NONE: _check_none,
+    ConstraintType.EQUAL: _check_equal,
+    ConstraintType.NOT_EQUAL: _check_not_equal,
+    ConstraintType.GREATER_THAN: _check_greater_than,
+    ConstraintType.LESS_THAN: _check_less_than,
+    ConstraintType.SUM: _check_sum,
+}
+
+_FULL_CHECKS = {
+    ConstraintType.GREATER_THAN: _check_full_greater_than,
+    ConstraintType.LESS_THAN: _check_full_less_than,
+    ConstraintType.SUM: _check_full_sum,
+}
+
+_COMPLETIONS = {
+    ConstraintType.NONE: _complete_none,
+    ConstraintType.EQUAL: _complete_equal,
+    ConstraintType.NOT_EQUAL: _complete_not_equal,
+    ConstraintType.GREATER_THAN: _complete_greater_than,
+    ConstraintType.LESS_THAN: _complete_less_than,
+    ConstraintType.SUM: _complete_sum,
+}
+
+
 @dataclass
 class Region:
     """Represents a colored region on the board with positions and a constraint."""
-    positions: Set[Position]
+    __slots__ = ("positions", "constraint", "keys", "size", "_ordered", "_check", "_complete")
+    
+    positions: AbstractSet[Position]
     constraint: Constraint
     
-    def validate(self, board_state: dict) -> bool:
+    def __post_init__(self):
+        # A region's positions never change: keep a frozenset for membership
+        # and a row-major tuple for iteration, which is cheaper than a set
+        self.positions = frozenset(self.positions)
+        self._ordered = tuple(sorted(self.positions, key=lambda pos: pos.key))
+        # Packed keys of the region's positions, used against Board.state
+        self.keys = frozenset(pos.key for pos in self._ordered)
+        self.size = len(self._ordered)
+        # Checks for this region's constraint type, chosen once
+        constraint_type = self.constraint.constraint_type
+        if constraint_type in _FULL_CHECKS and not isinstance(self.constraint.value, int):
+            # The bitmask checks need an int value; check full regions only
+            self._check = _FULL_CHECKS[constraint_type]
+            self._complete = _complete_none
+        else:
+            self._check = _CHECKS[constraint_type]
+            self._complete = _COMPLETIONS[constraint_type]
+    
+    def validate(self, board_state: dict, max_dots: int = MAX_DOTS) -> bool:
         """
         Validate that the constraint is satisfied for this region.
         
         Args:
-            board_state: Dictionary mapping Position to dot value
+            board_state: Dictionary mapping Position, or packed position key
+                as in Board.state, to dot value
+            max_dots: Largest dot value an empty position could still get
             
         Returns:
-            True if constraint is satisfied, False otherwise
+            True if constraint is satisfied, or can still be satisfied by
+            filling the region's empty positions, False otherwise
+        """
+        # Aggregate the placed values in one pass, without building a list
+        total = filled = seen = 0
+        get = board_state.get
+        for pos in self._ordered:
+            dots = get(pos)
+            if dots is None and 0 <= pos.col < KEY_COL_MASK:
+                dots = get(pos.key)
+            if dots is None:
+                continue
+            total += dots
+            filled += 1
+            seen |= 1 << dots
+        return self.validate_incremental(total, filled, seen, max_dots)
+    
+    def validate_incremental(self, total: int, filled: int, seen: int,
+                             max_dots: int = MAX_DOTS) -> bool:
         """
-        # Get all dot values in this region
-        dots = []
-        for pos in self.positions:
-            if pos in board_state and board_state[pos] is not None:
-                dots.append(board_state[pos])
+        Validate the constraint from running aggregates of the region's dots.
         
-        # If not all positions are filled, we can't validate yet
-        if len(dots) < len(self.positions):
-            return True  # Not fully filled yet, so not invalid
+        Args:
+            total: Sum of the dot values placed in the region
+            filled: Number of filled positions in the region
+            seen: Bitmask with bit d set if a dot value d is placed in the region
+            max_dots: Largest dot value an empty position could still get
+            
+        Returns:
+            True if constraint is satisfied, or can still be satisfied by
+            filling the region's empty positions, False otherwise
+        """
+        # Any sum up to max_dots per empty position can be added
+        reach = (1 << ((self.size - filled) * max_dots + 1)) - 1
+        return self._check(total, filled, seen, self.constraint.value, reach)
+    
+    def can_complete(self, total: int, filled: int, seen: int, counts: List[int]) -> bool:
+        """
+        Check whether the region's empty positions could be filled from the
+        dot values left on the unplaced dominoes.
         
-        # Validate based on constraint type
-        if self.constraint.constraint_type == ConstraintType.NONE:
+        Args:
+            total: Sum of the dot values placed in the region
+            filled: Number of filled positions in the region
+            seen: Bitmask with bit d set if a dot value d is placed in the region
+            counts: counts[d] is the number of unplaced domino halves with d dots
+            
+        Returns:
+            False if no completion satisfies the constraint, True otherwise
+        """
+        open_cells = self.size - filled
+        if not open_cells:
             return True
-        elif self.constraint.constraint_type == ConstraintType.EQUAL:
-            return len(set(dots)) == 1  # All dots are the same
-        elif self.constraint.constraint_type == ConstraintType.NOT_EQUAL:
-            return len(set(dots)) == len(dots)  # All dots are different
-        elif self.constraint.constraint_type == ConstraintType.GREATER_THAN:
-            return all(d > self.constraint.value for d in dots)
-        elif self.constraint.constraint_type == ConstraintType.LESS_THAN:
-            return all(d < self.constraint.value for d in dots)
-        elif self.constraint.constraint_type == ConstraintType.SUM:
-            return sum(dots) == self.constraint.value
-        
-        return False
+        return self._complete(total, seen, open_cells, self.constraint.value, counts)
 
 
 class Board:
     """Represents the game board for a pips puzzle."""
+    __slots__ = (
+        "rows", "cols", "regions", "available_dominoes", "valid_positions", "positions_by_key",
+        "state", "placed_dominoes", "occupied", "cell_bit", "adj", "pos_to_regions",
+        "cell_domain", "max_dots", "_dot_values", "_sum_reach", "_constrained_regions",
+        "_region_checks", "_region_sum", "_region_filled", "_region_seen", "_ordered_keys",
+        "_key_index", "_empty_cursor", "_filled", "_total", "_undo_stack",
+    )
     
     def __init__(self, rows: Optional[int] = None, cols: Optional[int] = None, 
                  regions: Optional[List[Region]] = None, valid_positions: Optional[Set[Position]] = None,
@@ -135,21 +395,144 @@ class Board:
             self.valid_positions = valid_positions
         elif rows is not None and cols is not None:
             # Rectangular board - generate all positions
-            self.valid_positions = {Position(r, c) for r in range(rows) for c in range(cols)}
+            self.valid_positions = {intern_position(r, c) for r in range(rows) for c in range(cols)}
         else:
             # No valid positions provided and no rows/cols - use empty set
             self.valid_positions = set()
         
-        self.state = {}  # Maps Position to dot value
+        for pos in self.valid_positions:
+            if not 0 <= pos.col < KEY_COL_MASK:
+                raise ValueError(f"Column {pos.col} is out of range (0-{KEY_COL_MASK - 1})")
+        
+        # Packed key -> Position for every valid position
+        self.positions_by_key = {pos.key: pos for pos in self.valid_positions}
+        # Packed keys sort in (row, col) order, so this is the row-major scan order
+        self._ordered_keys = sorted(self.positions_by_key)
+        # Packed key -> its index in _ordered_keys
+        self._key_index = {key: i for i, key in enumerate(self._ordered_keys)}
+        # Packed key -> occupancy bit of that position (bit i for the i-th
+        # position in row-major order)
+        self.cell_bit: Dict[int, int] = {key: 1 << i for key, i in self._key_index.items()}
+        
+        # Packed key -> keys of the valid positions to its right, below, left
+        # and above, in that order
+        self.adj: Dict[int, Tuple[int, ...]] = {
+            key: tuple(
+                neighbor for neighbor in (key + 1, key + KEY_DOWN, key - 1, key - KEY_DOWN)
+                if neighbor in self.positions_by_key
+            )
+            for key in self.positions_by_key
+        }
+        
+        # Indices of the constrained regions, and packed key -> indices of the
+        # constrained regions containing that position, most selective first.
+        # A region with a cell off the board can never be filled, so it never
+        # constrains anything; leaving it out also keeps the packed keys of
+        # such cells, which may alias valid ones, out of the tables.
+        self.pos_to_regions: Dict[int, List[int]] = {}
+        checked = sorted(range(len(self.regions)), key=lambda i: selectivity_rank(self.regions[i]))
+        self._constrained_regions: List[int] = []
+        for index in checked:
+            region = self.regions[index]
+            if region.constraint.constraint_type == ConstraintType.NONE:
+                continue
+            if not region.positions <= self.valid_positions:
+                continue
+            self._constrained_regions.append(index)
+            for key in region.keys:
+                self.pos_to_regions.setdefault(key, []).append(index)
+        
+        # Per region, the bound (check, constraint value, size) used by
+        # fits_keys to call the constraint check without going through Region
+        self._region_checks = [
+            (region._check, region.constraint.value, region.size) for region in self.regions
+        ]
+        
+        # Running aggregates per region, kept up to date as dominoes are placed
+        self._region_sum = [0] * len(self.regions)
+        self._region_filled = [0] * len(self.regions)
+        self._region_seen = [0] * len(self.regions)  # Bitmask of dot values present
+        
+        # Dot values found on the available dominoes
+        if available_dominoes is not None:
+            self._dot_values = {dots for domino in available_dominoes for dots in domino}
+        else:
+            self._dot_values = set(range(MAX_DOTS + 1))
+        self.max_dots = max(self._dot_values, default=0)
+        # _sum_reach[k] is the bitmask of the sums k empty positions can add
+        # (bit s set if k dot values add up to s), for every region size
+        self._sum_reach: List[int] = [1]
+        for _ in range(max((region.size for region in self.regions), default=0)):
+            previous = self._sum_reach[-1]
+            reach = 0
+            for dots in self._dot_values:
+                reach |= previous << dots
+            self._sum_reach.append(reach)
+        
+        # Packed key -> bitmask of the dot values each position can still hold
+        self.cell_domain: Dict[int, int] = self._precompute_domains()
+        
+        self.state = {}  # Maps packed position key to dot value
+        self.occupied = 0  # Bitmask of occupied positions, see cell_bit
+        self._filled = 0  # Number of occupied positions
+        self._total = len(self.positions_by_key)
+        # Every position before this index in _ordered_keys is occupied
+        self._empty_cursor = 0
         self.placed_dominoes = []  # List of placed Domino objects
+        # (key1, key2, saved seen masks) for each placement, so the most
+        # recent one can be undone without rescanning its regions
+        self._undo_stack: List[Tuple[int, int, List[Tuple[int, int]]]] = []
         
+    def _precompute_domains(self) -> Dict[int, int]:
+        """
+        Compute the dot values allowed at each position by its regions alone.
+        
+        Returns:
+            Dictionary mapping packed position keys to a bitmask of allowed values
+        """
+        values = self._dot_values
+        max_dots = self.max_dots
+        all_values = sum(1 << dots for dots in values)
+        
+        def between(low: int, high: int) -> int:
+            low, high = max(low, 0), min(high, max_dots)
+            return ((1 << (high + 1)) - (1 << low)) if low <= high else 0
+        
+        domains = {key: all_values for key in self.positions_by_key}
+        for key in domains:
+            for index in self.pos_to_regions.get(key, ()):
+                region = self.regions[index]
+                constraint_type = region.constraint.constraint_type
+                value = region.constraint.value
+                if constraint_type in _FULL_CHECKS and not isinstance(value, int):
+                    continue  # Malformed value: its region is only checked when full
+                if constraint_type == ConstraintType.GREATER_THAN:
+                    domains[key] &= between(value + 1, max_dots)
+                elif constraint_type == ConstraintType.LESS_THAN:
+                    domains[key] &= between(0, value - 1)
+                elif constraint_type == ConstraintType.SUM:
+                    # The other positions contribute between 0 and max_dots each
+                    domains[key] &= between(value - max_dots * (region.size - 1), value)
+                elif constraint_type == ConstraintType.NOT_EQUAL and region.size > len(values):
+                    domains[key] = 0  # Not enough distinct values to go around
+        return domains
+    
     def is_valid_position(self, pos: Position) -> bool:
         """Check if a position is valid on the board."""
         return pos in self.valid_positions
     
+    def _key_of(self, pos: Position) -> Optional[int]:
+        """Get the packed key of a valid position, or None for any other position."""
+        key = pos.key
+        return key if self.positions_by_key.get(key) == pos else None
+    
     def is_position_occupied(self, pos: Position) -> bool:
         """Check if a position is already occupied by a domino."""
-        return pos in self.state
+        return bool(self.occupied & self.cell_bit.get(self._key_of(pos), 0))
+    
+    def get_dots(self, pos: Position) -> Optional[int]:
+        """Get the dot value placed at a position, or None if it is empty."""
+        return self.state.get(self._key_of(pos))
     
     def place_domino(self, domino: Domino) -> bool:
         """
@@ -161,43 +544,198 @@ class Board:
         Returns:
             True if placement is valid and successful, False otherwise
         """
-        # Check if positions are valid and unoccupied
-        if not self.is_valid_position(domino.pos1) or not self.is_valid_position(domino.pos2):
-            return False
-        if self.is_position_occupied(domino.pos1) or self.is_position_occupied(domino.pos2):
+        key1 = self._key_of(domino.pos1)
+        key2 = self._key_of(domino.pos2)
+        if key1 is None or key2 is None or not self.place_keys(key1, key2, domino.dots1, domino.dots2):
             return False
         
-        # Place the domino
-        self.state[domino.pos1] = domino.dots1
-        self.state[domino.pos2] = domino.dots2
         self.placed_dominoes.append(domino)
+        return True
+    
+    def place_keys(self, key1: int, key2: int, dots1: int, dots2: int) -> bool:
+        """
+        Try to place dot values at two packed positions.
         
-        # Validate all regions
-        for region in self.regions:
-            if not region.validate(self.state):
-                # Invalid placement, undo
-                self.remove_domino(domino)
+        This is the allocation-free core of place_domino used by the solver's
+        search; it does not record a Domino in placed_dominoes.
+        
+        Args:
+            key1: Packed key of the first position
+            key2: Packed key of the second position
+            dots1: Dot value for the first position
+            dots2: Dot value for the second position
+            
+        Returns:
+            True if placement is valid and successful, False otherwise
+        """
+        if not self.fits_keys(key1, key2, dots1, dots2):
+            return False
+        self.commit_keys(key1, key2, dots1, dots2)
+        return True
+    
+    def commit_keys(self, key1: int, key2: int, dots1: int, dots2: int) -> None:
+        """
+        Place dot values at two packed positions without checking them.
+        
+        For callers that have already established that the placement fits,
+        as fits_keys would; place_keys is the checked version.
+        
+        Args:
+            key1: Packed key of the first position
+            key2: Packed key of the second position
+            dots1: Dot value for the first position
+            dots2: Dot value for the second position
+        """
+        # Place the domino and update the aggregates of the regions it touches
+        saved = []
+        for key, dots in ((key1, dots1), (key2, dots2)):
+            self.state[key] = dots
+            for index in self.pos_to_regions.get(key, ()):
+                saved.append((index, self._region_seen[index]))
+                self._region_sum[index] += dots
+                self._region_filled[index] += 1
+                self._region_seen[index] |= 1 << dots
+        self.occupied |= self.cell_bit[key1] | self.cell_bit[key2]
+        self._filled += 2
+        self._undo_stack.append((key1, key2, saved))
+    
+    def fits_keys(self, key1: int, key2: int, dots1: int, dots2: int) -> bool:
+        """
+        Check whether dot values could be placed at two packed positions.
+        
+        The board is not modified.
+        
+        Args:
+            key1: Packed key of the first position
+            key2: Packed key of the second position
+            dots1: Dot value for the first position
+            dots2: Dot value for the second position
+            
+        Returns:
+            True if placing the values would be valid, False otherwise
+        """
+        # Check if positions are valid and unoccupied
+        bit1 = self.cell_bit.get(key1)
+        bit2 = self.cell_bit.get(key2)
+        if bit1 is None or bit2 is None or self.occupied & (bit1 | bit2):
+            return False
+        if not (self.cell_domain[key1] >> dots1 & self.cell_domain[key2] >> dots2 & 1):
+            return False
+        
+        # Validate only the regions touched by this domino, with both halves
+        # added to a region that contains both positions
+        checks = self._region_checks
+        sum_reach = self._sum_reach
+        regions1 = self.pos_to_regions.get(key1, ())
+        regions2 = self.pos_to_regions.get(key2, ())
+        for index in regions1:
+            total = self._region_sum[index] + dots1
+            filled = self._region_filled[index] + 1
+            seen = self._region_seen[index] | 1 << dots1
+            if index in regions2:
+                total += dots2
+                filled += 1
+                seen |= 1 << dots2
+            check, value, size = checks[index]
+            if not check(total, filled, seen, value, sum_reach[size - filled]):
+                return False
+        for index in regions2:
+            if index in regions1:
+                continue
+            filled = self._region_filled[index] + 1
+            check, value, size = checks[index]
+            if not check(self._region_sum[index] + dots2, filled,
+                         self._region_seen[index] | 1 << dots2, value, sum_reach[size - filled]):
                 return False
+        return True
+    
+    def can_complete(self, counts: List[int]) -> bool:
+        """
+        Check whether every constrained region could still be completed.
         
+        Args:
+            counts: counts[d] is the number of unplaced domino halves with d dots
+            
+        Returns:
+            False if some region can no longer be completed, True otherwise
+        """
+        for index in self._constrained_regions:
+            if not self.regions[index].can_complete(
+                    self._region_sum[index], self._region_filled[index],
+                    self._region_seen[index], counts):
+                return False
         return True
     
     def remove_domino(self, domino: Domino) -> None:
         """Remove a domino from the board."""
-        if domino.pos1 in self.state:
-            del self.state[domino.pos1]
-        if domino.pos2 in self.state:
-            del self.state[domino.pos2]
-        if domino in self.placed_dominoes:
+        self.remove_keys(self._key_of(domino.pos1), self._key_of(domino.pos2))
+        if self.placed_dominoes and self.placed_dominoes[-1] == domino:
+            self.placed_dominoes.pop()
+        elif domino in self.placed_dominoes:
             self.placed_dominoes.remove(domino)
     
+    def remove_keys(self, key1: int, key2: int) -> None:
+        """Clear the dot values at two packed positions, undoing place_keys."""
+        state = self.state
+        undo_stack = self._undo_stack
+        if undo_stack and undo_stack[-1][0] == key1 and undo_stack[-1][1] == key2:
+            # Undoing the most recent placement: restore the saved seen masks
+            saved = undo_stack.pop()[2]
+            self.occupied &= ~(self.cell_bit[key1] | self.cell_bit[key2])
+            self._filled -= 2
+            self._empty_cursor = min(self._empty_cursor, self._key_index[key1], self._key_index[key2])
+            for key in (key1, key2):
+                dots = state.pop(key)
+                for index in self.pos_to_regions.get(key, ()):
+                    self._region_sum[index] -= dots
+                    self._region_filled[index] -= 1
+            for index, seen in reversed(saved):
+                self._region_seen[index] = seen
+            return
+        
+        # Out-of-order removal: older saved masks no longer apply
+        undo_stack.clear()
+        for key in (key1, key2):
+            if key not in state:
+                continue
+            dots = state.pop(key)
+            self.occupied &= ~self.cell_bit[key]
+            self._filled -= 1
+            self._empty_cursor = min(self._empty_cursor, self._key_index[key])
+            for index in self.pos_to_regions.get(key, ()):
+                self._region_sum[index] -= dots
+                self._region_filled[index] -= 1
+                # The value may still be present elsewhere in the region
+                self._region_seen[index] = 0
+                for other in self.regions[index].keys:
+                    if other in state:
+                        self._region_seen[index] |= 1 << state[other]
+    
     def is_complete(self) -> bool:
         """Check if the board is completely filled."""
-        return len(self.state) == len(self.valid_positions)
+        return self._filled == self._total
+    
+    def _advance_empty_cursor(self) -> int:
+        """Move the empty cursor past occupied positions and return it."""
+        state = self.state
+        keys = self._ordered_keys
+        cursor = self._empty_cursor
+        while cursor < self._total and keys[cursor] in state:
+            cursor += 1
+        self._empty_cursor = cursor
+        return cursor
+    
+    def get_empty_keys(self) -> List[int]:
+        """Get the packed keys of all empty positions in row-major order."""
+        state = self.state
+        cursor = self._advance_empty_cursor()
+        return [key for key in self._ordered_keys[cursor:] if key not in state]
+    
+    def get_first_empty_key(self) -> Optional[int]:
+        """Get the packed key of the first empty position in row-major order."""
+        cursor = self._advance_empty_cursor()
+        return self._ordered_keys[cursor] if cursor < self._total else None
     
     def get_empty_positions(self) -> List[Position]:
         """Get all empty positions on the board in a deterministic order."""
-        empty = []
-        for pos in sorted(self.valid_positions, key=lambda p: (p.row, p.col)):
-            if not self.is_position_occupied(pos):
-                empty.append(pos)
-        return empty
+        return [self.positions_by_key[key] for key in self.get_empty_keys()]
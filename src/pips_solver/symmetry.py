@@ -0,0 +1,104 @@
+"""Symmetries of a board's puzzle.
+
+A rotation or reflection of the board that maps its valid positions and
+its constrained regions onto themselves turns every solution into another
+solution, and every dead end into another dead end. The solver uses them
+to rule out the images of the partial states it has found to be dead.
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from .structures import KEY_COL_MASK, Board, Position, pack
+
+
+def _transforms(rows: int, cols: int) -> List[Callable[[int, int], Tuple[int, int]]]:
+    """
+    List the rotations and reflections of a bounding box other than the identity.
+    
+    Args:
+        rows: Largest row offset within the box
+        cols: Largest column offset within the box
+        
+    Returns:
+        Functions mapping a (row, col) offset to its image offset
+    """
+    return [
+        lambda r, c: (r, cols - c),
+        lambda r, c: (rows - r, c),
+        lambda r, c: (rows - r, cols - c),
+        lambda r, c: (c, r),
+        lambda r, c: (c, rows - r),
+        lambda r, c: (cols - c, r),
+        lambda r, c: (cols - c, rows - r),
+    ]
+
+
+def _key_map(positions: List[Position], transform: Callable[[int, int], Tuple[int, int]],
+             top: int, left: int) -> Optional[Dict[int, int]]:
+    """
+    Map the packed keys of the valid positions through a transform.
+    
+    Args:
+        positions: The valid positions of the board
+        transform: Function mapping a (row, col) offset to its image offset
+        top: Smallest row of the valid positions
+        left: Smallest column of the valid positions
+        
+    Returns:
+        Dictionary mapping each key to the key of its image, or None if the
+        transform does not map the valid positions onto themselves
+    """
+    mapping = {}
+    for pos in positions:
+        row, col = transform(pos.row - top, pos.col - left)
+        if left + col >= KEY_COL_MASK:
+            return None  # Transposed out of the packed key range
+        mapping[pos.key] = pack(top + row, left + col)
+    if set(mapping.values()) != mapping.keys():
+        return None
+    return mapping
+
+
+def board_symmetries(board: Board) -> List[Dict[int, int]]:
+    """
+    Find the rotations and reflections that leave a board's puzzle unchanged.
+    
+    A symmetry must map the valid positions onto themselves and every
+    constrained region onto a region with the same constraint.
+    
+    Args:
+        board: The board to find symmetries of
+        
+    Returns:
+        For each symmetry other than the identity, a dictionary mapping every
+        packed position key to the key of its image
+    """
+    positions = list(board.positions_by_key.values())
+    if not positions:
+        return []
+    top = min(pos.row for pos in positions)
+    left = min(pos.col for pos in positions)
+    height = max(pos.row for pos in positions) - top
+    width = max(pos.col for pos in positions) - left
+    try:
+        regions = Counter(
+            (board.regions[index].constraint, board.regions[index].keys)
+            for index in board._constrained_regions
+        )
+    except TypeError:
+        return []  # Unhashable constraint values (malformed input)
+    
+    symmetries = []
+    for transform in _transforms(height, width):
+        mapping = _key_map(positions, transform, top, left)
+        if mapping is None:
+            continue
+        images: Counter = Counter()
+        for (constraint, keys), count in regions.items():
+            if not keys <= mapping.keys():
+                break  # A region reaches outside the board
+            images[constraint, frozenset(mapping[key] for key in keys)] += count
+        else:
+            if images == regions:
+                symmetries.append(mapping)
+    return symmetries
@@ -0,0 +1,16 @@
+"""Shared fixtures for the pips solver tests."""
+
+import pytest
+from pips_solver.structures import Board, Position
+
+
+@pytest.fixture
+def board_4x7():
+    """An empty 4x7 rectangular board without regions."""
+    return Board(rows=4, cols=7, regions=[])
+
+
+@pytest.fixture(scope="module")
+def pair_positions():
+    """The two horizontally adjacent positions in the top-left corner."""
+    return frozenset({Position(0, 0), Position(0, 1)})
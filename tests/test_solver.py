@@ -2,10 +2,16 @@
 
 import pytest
 from pips_solver.structures import (
-    Board, Region, Domino, Position, Constraint, ConstraintType
+    Board, Region, Domino, Position, Constraint, ConstraintType, intern_position, pack, unpack
 )
 from pips_solver.solver import PipsSolver
 from pips_solver.parser import parse_constraint, parse_region, load_puzzle_from_string
+from pips_solver.main import format_solution
+from pips_solver.codegen import build_pair_checks
+from pips_solver.ac3 import ac3
+from pips_solver.matching import can_tile, max_matching
+from pips_solver import cache
+from pips_solver.symmetry import board_symmetries
 
 
 class TestPosition:
@@ -23,6 +29,32 @@ class TestPosition:
         pos2 = Position(1, 2)
         pos_set = {pos1, pos2}
         assert len(pos_set) == 1
+        
+    def test_positions_are_interned(self):
+        """Test that equal positions are one shared object, also after pickling."""
+        import copy
+        import pickle
+        pos = Position(1, 2)
+        assert Position(1, 2) is pos
+        assert intern_position(1, 2) is pos
+        assert pickle.loads(pickle.dumps(pos)) is pos
+        assert copy.deepcopy(pos) is pos
+        assert repr(pos) == "Position(row=1, col=2)"
+        assert Position(1, 5)._replace(col=2) is pos
+        assert Position._make([1, 2]) is pos
+        
+        # A float coordinate equals its int but must not be shared with it
+        assert type(Position(3.0, 4).row) is float
+        assert type(Position(3, 4).row) is int
+        assert len(Board(rows=4, cols=5).valid_positions) == 20
+        
+    def test_pack_unpack_roundtrip(self):
+        """Test that packed keys round-trip and sort in row-major order."""
+        positions = [Position(0, 0), Position(0, 5), Position(1, 0), Position(3, 255)]
+        keys = [pack(p.row, p.col) for p in positions]
+        assert [unpack(k) for k in keys] == positions
+        assert keys == sorted(keys)
+        assert [p.key for p in positions] == keys
 
 
 class TestConstraint:
@@ -47,84 +79,151 @@ class TestConstraint:
 class TestRegion:
     """Tests for Region class."""
     
-    def test_region_validate_equal_success(self):
+    def test_region_validate_equal_success(self, pair_positions):
         """Test that equal constraint validates correctly."""
-        positions = {Position(0, 0), Position(0, 1)}
         constraint = Constraint(ConstraintType.EQUAL)
-        region = Region(positions, constraint)
+        region = Region(pair_positions, constraint)
         
         board_state = {Position(0, 0): 3, Position(0, 1): 3}
         assert region.validate(board_state) is True
         
-    def test_region_validate_equal_fail(self):
+    def test_region_validate_equal_fail(self, pair_positions):
         """Test that equal constraint fails when values differ."""
-        positions = {Position(0, 0), Position(0, 1)}
         constraint = Constraint(ConstraintType.EQUAL)
-        region = Region(positions, constraint)
+        region = Region(pair_positions, constraint)
         
         board_state = {Position(0, 0): 3, Position(0, 1): 4}
         assert region.validate(board_state) is False
         
-    def test_region_validate_sum_success(self):
+    def test_region_validate_sum_success(self, pair_positions):
         """Test that sum constraint validates correctly."""
-        positions = {Position(0, 0), Position(0, 1)}
         constraint = Constraint(ConstraintType.SUM, 7)
-        region = Region(positions, constraint)
+        region = Region(pair_positions, constraint)
         
         board_state = {Position(0, 0): 3, Position(0, 1): 4}
         assert region.validate(board_state) is True
         
-    def test_region_validate_sum_fail(self):
+    def test_region_validate_sum_fail(self, pair_positions):
         """Test that sum constraint fails when sum is wrong."""
-        positions = {Position(0, 0), Position(0, 1)}
         constraint = Constraint(ConstraintType.SUM, 7)
-        region = Region(positions, constraint)
+        region = Region(pair_positions, constraint)
         
         board_state = {Position(0, 0): 3, Position(0, 1): 3}
         assert region.validate(board_state) is False
         
-    def test_region_validate_incomplete(self):
+    def test_region_validate_incomplete(self, pair_positions):
         """Test that incomplete region returns True."""
-        positions = {Position(0, 0), Position(0, 1)}
         constraint = Constraint(ConstraintType.EQUAL)
-        region = Region(positions, constraint)
+        region = Region(pair_positions, constraint)
         
         board_state = {Position(0, 0): 3}
         assert region.validate(board_state) is True
+    
+    def test_region_validate_not_equal_and_bounds(self):
+        """Test not-equal, greater-than and less-than constraints on a full region."""
+        positions = {Position(0, 0), Position(0, 1), Position(1, 0)}
+        distinct = {Position(0, 0): 2, Position(0, 1): 5, Position(1, 0): 3}
+        repeated = {Position(0, 0): 2, Position(0, 1): 5, Position(1, 0): 2}
+        
+        assert Region(positions, Constraint(ConstraintType.NOT_EQUAL)).validate(distinct) is True
+        assert Region(positions, Constraint(ConstraintType.NOT_EQUAL)).validate(repeated) is False
+        assert Region(positions, Constraint(ConstraintType.GREATER_THAN, 1)).validate(distinct) is True
+        assert Region(positions, Constraint(ConstraintType.GREATER_THAN, 2)).validate(distinct) is False
+        assert Region(positions, Constraint(ConstraintType.LESS_THAN, 6)).validate(distinct) is True
+        assert Region(positions, Constraint(ConstraintType.LESS_THAN, 5)).validate(distinct) is False
+        
+    def test_region_validate_incremental(self, pair_positions):
+        """Test constraint checks from running sum, fill count and seen mask."""
+        seen_2_5 = (1 << 2) | (1 << 5)
+        
+        assert Region(pair_positions, Constraint(ConstraintType.GREATER_THAN, 1)).validate_incremental(7, 2, seen_2_5)
+        assert not Region(pair_positions, Constraint(ConstraintType.GREATER_THAN, 2)).validate_incremental(7, 2, seen_2_5)
+        assert Region(pair_positions, Constraint(ConstraintType.LESS_THAN, 6)).validate_incremental(7, 2, seen_2_5)
+        assert not Region(pair_positions, Constraint(ConstraintType.LESS_THAN, 5)).validate_incremental(7, 2, seen_2_5)
+        assert Region(pair_positions, Constraint(ConstraintType.NOT_EQUAL)).validate_incremental(7, 2, seen_2_5)
+        assert not Region(pair_positions, Constraint(ConstraintType.EQUAL)).validate_incremental(7, 2, seen_2_5)
+        # A partially filled region fails only once no completion can work
+        assert Region(pair_positions, Constraint(ConstraintType.SUM, 8)).validate_incremental(2, 1, 1 << 2)
+        assert not Region(pair_positions, Constraint(ConstraintType.SUM, 9)).validate_incremental(2, 1, 1 << 2)
+        assert Region(pair_positions, Constraint(ConstraintType.SUM, 9)).validate_incremental(2, 1, 1 << 2, max_dots=9)
+        assert not Region(pair_positions, Constraint(ConstraintType.SUM, 1)).validate_incremental(2, 1, 1 << 2)
+    
+    def test_region_positions_are_frozen(self):
+        """Test that a region stores its positions as an immutable set."""
+        region = Region({Position(1, 0), Position(0, 1), Position(0, 0)}, Constraint(ConstraintType.NONE))
+        assert isinstance(region.positions, frozenset)
+        assert Position(0, 1) in region.positions
+        assert len(region.positions) == 3
+        assert region == Region({Position(0, 0), Position(0, 1), Position(1, 0)}, Constraint(ConstraintType.NONE))
+    
+    def test_region_validate_partial(self):
+        """Test that partial regions fail once their constraint is violated."""
+        positions = {Position(0, 0), Position(0, 1), Position(0, 2)}
+        partial = {Position(0, 0): 2, Position(0, 1): 2}
+        
+        assert Region(positions, Constraint(ConstraintType.EQUAL)).validate(partial) is True
+        assert Region(positions, Constraint(ConstraintType.NOT_EQUAL)).validate(partial) is False
+        assert Region(positions, Constraint(ConstraintType.SUM, 10)).validate(partial) is True
+        assert Region(positions, Constraint(ConstraintType.SUM, 11)).validate(partial) is False
+        assert Region(positions, Constraint(ConstraintType.SUM, 3)).validate(partial) is False
+    
+    def test_region_validate_board_state(self, board_4x7):
+        """Test validating against a board's state, which is keyed by packed keys."""
+        region = Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.EQUAL))
+        board = board_4x7
+        board.commit_keys(pack(0, 0), pack(0, 1), 3, 4)
+        
+        assert region.validate(board.state) is False
+        assert Region(region.positions, Constraint(ConstraintType.SUM, 7)).validate(board.state) is True
 
 
 class TestBoard:
     """Tests for Board class."""
     
-    def test_board_creation(self):
+    def test_board_creation(self, board_4x7):
         """Test board creation."""
-        regions = []
-        board = Board(rows=4, cols=7, regions=regions)
+        board = board_4x7
         assert board.rows == 4
         assert board.cols == 7
         
-    def test_board_valid_position(self):
+    def test_board_valid_position(self, board_4x7):
         """Test position validation."""
-        board = Board(rows=4, cols=7, regions=[])
+        board = board_4x7
         assert board.is_valid_position(Position(0, 0)) is True
         assert board.is_valid_position(Position(3, 6)) is True
         assert board.is_valid_position(Position(4, 0)) is False
         assert board.is_valid_position(Position(0, 7)) is False
         
-    def test_board_place_domino(self):
+    def test_board_rejects_wide_columns(self):
+        """Test that columns outside the packed key range are rejected."""
+        with pytest.raises(ValueError):
+            Board(valid_positions={Position(0, 255), Position(1, 255)})
+        
+    def test_board_ignores_wide_columns_off_the_board(self):
+        """Test that positions past the packed key range never alias a valid cell."""
+        # Column 256 would pack to the key of (1, 0)
+        off_board = [Position(0, 256), Position(0, 257)]
+        region = Region(set(off_board), Constraint(ConstraintType.EQUAL))
+        board = Board(rows=2, cols=2, regions=[region])
+        
+        assert board.place_domino(Domino(off_board[0], off_board[1], 3, 4)) is False
+        assert board.state == {}
+        assert board.get_dots(off_board[0]) is None
+        assert board.place_domino(Domino(Position(1, 0), Position(1, 1), 3, 4)) is True
+        assert board.is_position_occupied(off_board[0]) is False
+        
+    def test_board_place_domino(self, board_4x7):
         """Test placing a domino on the board."""
-        regions = []
-        board = Board(rows=4, cols=7, regions=regions)
+        board = board_4x7
         
         domino = Domino(Position(0, 0), Position(0, 1), 3, 4)
         assert board.place_domino(domino) is True
         assert board.is_position_occupied(Position(0, 0)) is True
         assert board.is_position_occupied(Position(0, 1)) is True
         
-    def test_board_place_domino_invalid(self):
+    def test_board_place_domino_invalid(self, board_4x7):
         """Test that placing domino on occupied position fails."""
-        regions = []
-        board = Board(rows=4, cols=7, regions=regions)
+        board = board_4x7
         
         domino1 = Domino(Position(0, 0), Position(0, 1), 3, 4)
         board.place_domino(domino1)
@@ -132,10 +231,9 @@ class TestBoard:
         domino2 = Domino(Position(0, 1), Position(0, 2), 5, 6)
         assert board.place_domino(domino2) is False
         
-    def test_board_remove_domino(self):
+    def test_board_remove_domino(self, board_4x7):
         """Test removing a domino from the board."""
-        regions = []
-        board = Board(rows=4, cols=7, regions=regions)
+        board = board_4x7
         
         domino = Domino(Position(0, 0), Position(0, 1), 3, 4)
         board.place_domino(domino)
@@ -143,6 +241,133 @@ class TestBoard:
         
         assert board.is_position_occupied(Position(0, 0)) is False
         assert board.is_position_occupied(Position(0, 1)) is False
+    
+    def test_board_remove_domino_keeps_region_state(self):
+        """Test that removing a domino keeps values placed elsewhere in a region."""
+        square = {Position(0, 0), Position(0, 1), Position(1, 0), Position(1, 1)}
+        board = Board(rows=2, cols=2, regions=[Region(square, Constraint(ConstraintType.EQUAL))])
+        
+        top = Domino(Position(0, 0), Position(0, 1), 2, 2)
+        assert board.place_domino(top) is True
+        assert board.place_domino(Domino(Position(1, 0), Position(1, 1), 2, 2)) is True
+        
+        board.remove_domino(top)
+        assert board.place_domino(Domino(Position(0, 0), Position(0, 1), 5, 5)) is False
+        assert board.place_domino(top) is True
+        assert board.is_complete()
+        
+    def test_board_remove_dominoes_in_any_order(self):
+        """Test that region aggregates are restored whatever the removal order."""
+        square = {Position(0, 0), Position(0, 1), Position(1, 0), Position(1, 1)}
+        board = Board(rows=2, cols=2, regions=[Region(square, Constraint(ConstraintType.NOT_EQUAL))])
+        
+        for first_out in (0, 1):
+            dominoes = [
+                Domino(Position(0, 0), Position(0, 1), 1, 2),
+                Domino(Position(1, 0), Position(1, 1), 3, 4),
+            ]
+            for domino in dominoes:
+                assert board.place_domino(domino) is True
+            board.remove_domino(dominoes[first_out])
+            board.remove_domino(dominoes[1 - first_out])
+            
+            assert board.placed_dominoes == []
+            assert board._region_sum == [0]
+            assert board._region_filled == [0]
+            assert board._region_seen == [0]
+        
+    def test_board_orders_regions_by_selectivity(self):
+        """Test that NONE regions are skipped and tighter regions are checked first."""
+        cell = Position(0, 0)
+        regions = [
+            Region({cell}, Constraint(ConstraintType.NONE)),
+            Region({cell, Position(0, 1)}, Constraint(ConstraintType.SUM, 4)),
+            Region({cell}, Constraint(ConstraintType.GREATER_THAN, 0)),
+            Region({cell, Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.EQUAL)),
+        ]
+        board = Board(rows=2, cols=2, regions=regions)
+        assert board.pos_to_regions[pack(0, 0)] == [3, 1, 2]
+        
+    def test_board_cell_domains(self):
+        """Test that region constraints restrict the values allowed per cell."""
+        regions = [
+            Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.SUM, 10)),
+            Region({Position(1, 0)}, Constraint(ConstraintType.GREATER_THAN, 4)),
+            Region({Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.LESS_THAN, 6)),
+        ]
+        board = Board(rows=2, cols=2, regions=regions)
+        # Summing to 10 over two cells needs at least 4 in each
+        assert board.cell_domain[pack(0, 0)] == 0b1110000
+        assert board.cell_domain[pack(1, 0)] == 0b0100000
+        assert board.cell_domain[pack(1, 1)] == 0b0111111
+        
+        domino = Domino(Position(0, 0), Position(0, 1), 3, 6)
+        assert board.place_domino(domino) is False
+        
+    def test_board_adjacency(self):
+        """Test that neighbours are found in all four directions within the board."""
+        board = Board(valid_positions={Position(0, 0), Position(0, 1), Position(1, 1), Position(1, 2)})
+        assert set(board.adj[pack(0, 1)]) == {pack(0, 0), pack(1, 1)}
+        assert set(board.adj[pack(1, 1)]) == {pack(0, 1), pack(1, 2)}
+        assert board.adj[pack(0, 0)] == (pack(0, 1),)
+        
+    def test_board_can_complete_regions(self):
+        """Test region completion checks against the dot values left."""
+        positions = {Position(0, 0), Position(0, 1), Position(0, 2)}
+        regions = [
+            Region(positions, Constraint(ConstraintType.EQUAL)),
+            Region({Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.SUM, 10)),
+        ]
+        board = Board(rows=2, cols=3, regions=regions)
+        
+        # counts[d] is the number of domino halves with d dots left
+        assert board.can_complete([0, 0, 3, 0, 0, 4, 1])
+        # No value is left three times for the equal region
+        assert not board.can_complete([0, 0, 2, 0, 0, 2, 2])
+        # The two largest values left sum to 9 only
+        assert not board.can_complete([0, 0, 3, 0, 1, 1, 0])
+    
+    def test_board_sum_reach_follows_dot_values(self):
+        """Test that sum regions only accept remainders the dot values can add."""
+        for target, fits in ((3, False), (4, True)):
+            regions = [Region({Position(0, 0), Position(1, 0)}, Constraint(ConstraintType.SUM, target))]
+            board = Board(rows=2, cols=2, regions=regions, available_dominoes=[(1, 3), (1, 1)])
+            # 1 at (0, 0) leaves target - 1 for one more value out of {1, 3}
+            assert board.fits_keys(pack(0, 0), pack(0, 1), 1, 3) is fits
+            checks = dict(build_pair_checks(board)[pack(0, 0)])
+            assert checks[pack(0, 1)](1, 3) is fits
+        
+    def test_board_occupancy_mask(self):
+        """Test that the occupancy bitmask follows placements and removals."""
+        board = Board(rows=2, cols=2, regions=[])
+        domino = Domino(Position(0, 1), Position(1, 1), 2, 3)
+        assert board.place_domino(domino)
+        assert board.occupied == board.cell_bit[pack(0, 1)] | board.cell_bit[pack(1, 1)]
+        assert board.is_position_occupied(Position(1, 1))
+        assert not board.is_position_occupied(Position(1, 0))
+        assert not board.is_position_occupied(Position(5, 5))
+        
+        board.remove_domino(domino)
+        assert board.occupied == 0
+    
+    def test_board_first_empty_key(self):
+        """Test that the first empty position is found in row-major order."""
+        board = Board(rows=2, cols=2, regions=[])
+        assert board.get_first_empty_key() == pack(0, 0)
+        
+        board.place_domino(Domino(Position(0, 0), Position(0, 1), 1, 2))
+        assert board.get_first_empty_key() == pack(1, 0)
+        assert board.get_empty_positions() == [Position(1, 0), Position(1, 1)]
+        
+        board.place_domino(Domino(Position(1, 0), Position(1, 1), 3, 4))
+        assert board.get_first_empty_key() is None
+        assert board.is_complete()
+        
+        # Removing an earlier domino out of order makes its cells empty again
+        board.remove_domino(Domino(Position(0, 0), Position(0, 1), 1, 2))
+        assert not board.is_complete()
+        assert board.get_first_empty_key() == pack(0, 0)
+        assert board.get_empty_positions() == [Position(0, 0), Position(0, 1)]
 
 
 class TestParser:
@@ -161,6 +386,21 @@ class TestParser:
         assert constraint.constraint_type == ConstraintType.SUM
         assert constraint.value == 10
         
+    def test_parse_constraint_word_spellings(self):
+        """Test parsing constraints written as words instead of symbols."""
+        assert parse_constraint({"type": "equal"}).constraint_type == ConstraintType.EQUAL
+        assert parse_constraint({"type": "notequal"}).constraint_type == ConstraintType.NOT_EQUAL
+        assert parse_constraint({"type": "greater_than", "value": 3}).constraint_type == ConstraintType.GREATER_THAN
+        assert parse_constraint({"type": "less_than", "value": 3}).constraint_type == ConstraintType.LESS_THAN
+        constraint = parse_constraint({"type": "number", "value": 7})
+        assert constraint.constraint_type == ConstraintType.SUM
+        assert constraint.value == 7
+        
+    def test_parsed_constraints_are_shared(self):
+        """Test that equal constraint definitions parse to one shared object."""
+        assert parse_constraint({"type": "sum", "value": 4}) is parse_constraint({"type": "sum", "value": 4})
+        assert parse_constraint({"type": "="}) is not parse_constraint({"type": "!="})
+        
     def test_parse_region(self):
         """Test parsing a region."""
         data = {
@@ -172,6 +412,21 @@ class TestParser:
         assert Position(0, 0) in region.positions
         assert region.constraint.constraint_type == ConstraintType.EQUAL
         
+    def test_parsed_positions_are_shared(self):
+        """Test that parsing yields one shared Position object per cell."""
+        board = load_puzzle_from_string("""
+        {
+            "valid_positions": [{"row": 0, "col": 0}, {"row": 0, "col": 1}],
+            "regions": [
+                {"positions": [{"row": 0, "col": 0}, {"row": 0, "col": 1}], "constraint": {"type": "="}}
+            ]
+        }
+        """)
+        region_positions = {pos: pos for pos in board.regions[0].positions}
+        for pos in board.valid_positions:
+            assert region_positions[pos] is pos
+        assert unpack(pack(0, 1)) is intern_position(0, 1)
+        
     def test_load_puzzle_from_string(self):
         """Test loading a puzzle from JSON string."""
         json_str = """
@@ -190,17 +445,67 @@ class TestParser:
         assert board.rows == 2
         assert board.cols == 2
         assert len(board.regions) == 1
+        
+    def test_load_puzzle_without_orjson(self, monkeypatch, tmp_path):
+        """Test that puzzles load through the stdlib json fallback as well."""
+        import importlib
+        import json
+        import sys
+        from pips_solver import parser
+        puzzle = '{"rows": 1, "cols": 2, "regions": [{"positions": [{"row": 0, "col": 0}], "constraint": {"type": "sum", "value": 3}}]}'
+        path = tmp_path / "puzzle.json"
+        path.write_text(puzzle)
+        
+        monkeypatch.setitem(sys.modules, "orjson", None)  # Makes the import fail
+        try:
+            importlib.reload(parser)
+            assert parser._loads is json.loads
+            for board in (parser.load_puzzle_from_string(puzzle), parser.load_puzzle(str(path))):
+                assert board.valid_positions == {Position(0, 0), Position(0, 1)}
+                assert board.regions[0].constraint == Constraint(ConstraintType.SUM, 3)
+        finally:
+            monkeypatch.undo()
+            importlib.reload(parser)
+        
+    def test_float_constraint_value_is_solved(self):
+        """Test that a sum given as a float is checked like the int it equals."""
+        board = load_puzzle_from_string("""
+        {
+            "rows": 2,
+            "cols": 2,
+            "dominoes": [[3, 4], [1, 5]],
+            "regions": [
+                {"positions": [{"row": 0, "col": 0}, {"row": 0, "col": 1}], "constraint": {"type": "sum", "value": 7.0}}
+            ]
+        }
+        """)
+        solver = PipsSolver(board)
+        assert solver.solve() is True
+        assert board.get_dots(Position(0, 0)) + board.get_dots(Position(0, 1)) == 7
+        
+    def test_sum_without_value_has_no_solution(self):
+        """Test that a sum region missing its value cannot be satisfied."""
+        board = load_puzzle_from_string("""
+        {
+            "rows": 1,
+            "cols": 2,
+            "regions": [
+                {"positions": [{"row": 0, "col": 0}, {"row": 0, "col": 1}], "constraint": {"type": "sum"}}
+            ]
+        }
+        """)
+        solver = PipsSolver(board)
+        assert solver.solve() is False
 
 
 class TestSolver:
     """Tests for solver."""
     
-    def test_solver_simple_puzzle(self):
+    def test_solver_simple_puzzle(self, pair_positions):
         """Test solver on a simple puzzle."""
         # Create a simple 2x2 puzzle with one region
-        positions = {Position(0, 0), Position(0, 1)}
         constraint = Constraint(ConstraintType.EQUAL)
-        region = Region(positions, constraint)
+        region = Region(pair_positions, constraint)
         
         board = Board(rows=2, cols=2, regions=[region])
         solver = PipsSolver(board)
@@ -208,6 +513,112 @@ class TestSolver:
         # The solver should be able to find a solution
         assert solver.solve() is True
         assert len(board.placed_dominoes) == 2
+    
+    def test_solver_picks_most_constrained_position(self):
+        """Test that the next position is the one with fewest legal placements."""
+        #  X X X
+        #      X
+        valid_positions = {Position(0, 0), Position(0, 1), Position(0, 2), Position(1, 2)}
+        regions = [Region({Position(0, 2), Position(1, 2)}, Constraint(ConstraintType.EQUAL))]
+        board = Board(valid_positions=valid_positions, regions=regions)
+        solver = PipsSolver(board)
+        
+        # Small boards, and searches that have not backtracked yet, fill in
+        # row-major order
+        assert solver._pick_next_position() == pack(0, 0)
+        solver.MRV_MIN_POSITIONS = 0
+        assert solver._pick_next_position() == pack(0, 0)
+        solver._rank_positions = True
+        
+        # (1, 2) can only hold a double shared with (0, 2)
+        assert solver._pick_next_position() == pack(1, 2)
+        assert solver.solve() is True
+        assert board.is_complete()
+    
+    def test_solver_remembers_dead_states(self):
+        """Test that exhausted partial states are recorded and skipped."""
+        # Both cells must be 1 but only the 1-2 tile is available
+        regions = [
+            Region({Position(0, 0)}, Constraint(ConstraintType.SUM, 1)),
+            Region({Position(0, 1)}, Constraint(ConstraintType.SUM, 1)),
+        ]
+        board = Board(rows=1, cols=2, regions=regions, available_dominoes=[(1, 2)])
+        solver = PipsSolver(board)
+        
+        assert solver._search() is False
+        assert (0, frozenset()) in solver._dead
+        assert solver._search() is False
+    
+    def test_board_symmetries(self):
+        """Test that only rotations and reflections preserving the regions are kept."""
+        assert len(board_symmetries(Board(rows=2, cols=2, regions=[]))) == 7
+        assert len(board_symmetries(Board(rows=2, cols=3, regions=[]))) == 3
+        
+        regions = [Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.EQUAL))]
+        mirror = {pack(0, 0): pack(0, 1), pack(0, 1): pack(0, 0), pack(1, 0): pack(1, 1), pack(1, 1): pack(1, 0)}
+        assert board_symmetries(Board(rows=2, cols=2, regions=regions)) == [mirror]
+        
+    def test_solver_records_symmetric_dead_states(self):
+        """Test that the mirror image of a dead state is recorded as dead too."""
+        # Two 2x2 halves of a 2x4 board that both need a sum of 14
+        regions = [
+            Region({Position(r, c) for r in range(2) for c in cols}, Constraint(ConstraintType.SUM, 14))
+            for cols in ((0, 1), (2, 3))
+        ]
+        board = Board(rows=2, cols=4, regions=regions, available_dominoes=[(1, 2), (0, 3), (2, 4), (4, 6)])
+        solver = PipsSolver(board)
+        
+        assert solver.solve() is False
+        assert len(solver._symmetries) == 3
+        assert any(state for _, state in solver._dead)
+        for used, state in list(solver._dead):
+            for mapping in solver._symmetries:
+                assert (used, frozenset((mapping[key], dots) for key, dots in state)) in solver._dead
+        
+    def test_solver_solve_parallel(self):
+        """Test that the parallel solver finds a valid solution."""
+        regions = [
+            Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.SUM, 9)),
+            Region({Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.EQUAL)),
+        ]
+        board = Board(rows=2, cols=3, regions=regions)
+        solver = PipsSolver(board)
+        
+        assert solver.solve_parallel(workers=2, split_depth=2) is True
+        assert board.is_complete()
+        assert len(board.placed_dominoes) == 3
+        state = {pos: board.get_dots(pos) for pos in board.valid_positions}
+        assert all(region.validate(state) for region in regions)
+    
+    def test_solver_solve_portfolio(self, pair_positions):
+        """Test that racing shuffled searches finds a valid solution or proves none."""
+        regions = [
+            Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.SUM, 9)),
+            Region({Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.EQUAL)),
+        ]
+        board = Board(rows=2, cols=3, regions=regions)
+        
+        assert PipsSolver(board).solve_portfolio(workers=3, seed=7) is True
+        assert board.is_complete()
+        state = {pos: board.get_dots(pos) for pos in board.valid_positions}
+        assert all(region.validate(state) for region in regions)
+        
+        unsolvable = Board(rows=1, cols=2, regions=[Region(pair_positions, Constraint(ConstraintType.SUM, 13))])
+        assert PipsSolver(unsolvable).solve_portfolio(workers=2) is False
+    
+    def test_solver_parallel_threshold(self, monkeypatch):
+        """Test that solve() hands boards above the threshold to solve_parallel."""
+        calls = []
+        monkeypatch.setattr(PipsSolver, "solve_parallel", lambda solver: calls.append(solver) or True)
+        monkeypatch.setattr(PipsSolver, "parallel_threshold", 4)
+        
+        small = PipsSolver(Board(rows=2, cols=2, regions=[]))
+        assert small.solve() is True
+        assert calls == []
+        
+        large = PipsSolver(Board(rows=2, cols=3, regions=[]))
+        assert large.solve() is True
+        assert calls == [large]
 
 
 class TestArbitraryShapes:
@@ -354,6 +765,31 @@ class TestArbitraryShapes:
         # Empty board is already complete
         assert board.is_complete() is True
         assert solver.solve() is True
+    
+    def test_region_reaching_off_the_board(self):
+        """Test that a region with a cell off the board never constrains the board."""
+        # The region can never be filled, so its sum is never checked
+        regions = [
+            Region({Position(0, 0), Position(0, 5)}, Constraint(ConstraintType.SUM, 13)),
+            Region({Position(0, 1), Position(1, 1)}, Constraint(ConstraintType.EQUAL)),
+        ]
+        board = Board(rows=1, cols=2, regions=regions, available_dominoes=[(1, 2)])
+        solver = PipsSolver(board)
+        
+        assert solver.solve() is True
+        assert board.is_complete()
+        assert board.regions == regions
+    
+    def test_unbalanced_board_is_rejected_before_search(self):
+        """Test that a board no tiling can cover is rejected by its colour counts."""
+        # A T shape: three positions of one checkerboard colour, one of the other
+        valid_positions = {Position(0, 0), Position(0, 1), Position(0, 2), Position(1, 1)}
+        board = Board(valid_positions=valid_positions, regions=[])
+        solver = PipsSolver(board)
+        
+        assert solver._can_cover() is False
+        assert solver.solve() is False
+        assert board.state == {}
 
 
 class TestAvailableDominoes:
@@ -419,6 +855,19 @@ class TestAvailableDominoes:
         # Should not be able to solve (need 4 dominoes, only have 2)
         assert solver.solve() is False
     
+    def test_duplicate_dominoes_are_separate_tiles(self):
+        """Test that a domino listed twice can be placed twice."""
+        dominoes = [(1, 1), (1, 1)]
+        regions = [
+            Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.EQUAL)),
+            Region({Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.EQUAL))
+        ]
+        board = Board(rows=2, cols=2, regions=regions, available_dominoes=dominoes)
+        solver = PipsSolver(board)
+        
+        assert solver.solve() is True
+        assert solver.used_mask == 0b11
+    
     def test_parse_puzzle_with_dominoes(self):
         """Test parsing a puzzle with specified dominoes."""
         json_str = """
@@ -498,3 +947,164 @@ class TestAvailableDominoes:
         placed_tuples = [(min(d.dots1, d.dots2), max(d.dots1, d.dots2)) for d in board.placed_dominoes]
         assert (2, 2) in placed_tuples
         assert (3, 3) in placed_tuples
+
+
+class TestFormatSolution:
+    """Tests for solution formatting."""
+    
+    def test_format_solution_with_hole(self):
+        """Test that holes are shown as dots and placed values as digits."""
+        valid_positions = {
+            Position(0, 0), Position(0, 1), Position(0, 2),
+            Position(1, 0),                 Position(1, 2),
+        }
+        board = Board(valid_positions=valid_positions, regions=[])
+        board.place_domino(Domino(Position(0, 0), Position(1, 0), 1, 2))
+        board.place_domino(Domino(Position(0, 1), Position(0, 2), 3, 4))
+        
+        lines = format_solution(PipsSolver(board)).splitlines()
+        # Position (1, 2) is valid but empty, so it is rendered as a space
+        assert lines[2] == "1 3 4"
+        assert lines[3] == "2 .  "
+        assert "Placed 2 dominoes:" in lines
+
+
+class TestCodegen:
+    """Tests for generated placement checks."""
+    
+    def test_pair_checks_match_fits_keys(self):
+        """Test that every generated check agrees with Board.fits_keys."""
+        regions = [
+            Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.EQUAL)),
+            Region({Position(0, 2), Position(1, 2)}, Constraint(ConstraintType.NOT_EQUAL)),
+            Region({Position(1, 0), Position(1, 1)}, Constraint(ConstraintType.SUM, 7)),
+            Region({Position(2, 0), Position(2, 1)}, Constraint(ConstraintType.GREATER_THAN, 3)),
+            Region({Position(2, 2)}, Constraint(ConstraintType.LESS_THAN, 2)),
+        ]
+        board = Board(rows=3, cols=3, regions=regions)
+        pair_checks = build_pair_checks(board)
+        
+        def assert_agree():
+            for key1, checks in pair_checks.items():
+                assert [key2 for key2, _ in checks] == list(board.adj[key1])
+                for key2, fits in checks:
+                    if key1 in board.state or key2 in board.state:
+                        continue
+                    for dots1 in range(7):
+                        for dots2 in range(7):
+                            assert fits(dots1, dots2) == board.fits_keys(key1, key2, dots1, dots2)
+        
+        assert_agree()
+        # The checks read the live region aggregates
+        assert board.place_domino(Domino(Position(0, 1), Position(1, 1), 4, 3))
+        assert_agree()
+    
+    def test_pair_checks_share_compiled_code(self):
+        """Test that boards of the same puzzle reuse compiled code but not state."""
+        regions = [Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.SUM, 5))]
+        first = Board(rows=2, cols=2, regions=regions)
+        second = Board(rows=2, cols=2, regions=regions)
+        check1 = dict(build_pair_checks(first)[pack(0, 0)])[pack(1, 0)]
+        check2 = dict(build_pair_checks(second)[pack(0, 0)])[pack(1, 0)]
+        
+        assert check1.__code__ is check2.__code__
+        first.place_keys(pack(0, 1), pack(1, 1), 5, 0)
+        assert check1(1, 0) is False
+        assert check2(1, 0) is True
+
+
+class TestMatching:
+    """Tests for the matching check of the empty positions."""
+    
+    def test_max_matching(self):
+        """Test that augmenting paths reroute earlier matches."""
+        # Left 1 can only take right 10, which left 0 takes first
+        graph = {0: [10, 11], 1: [10], 2: [11, 12]}
+        
+        assert max_matching(graph) == 3
+        assert max_matching({0: [10], 1: [10]}) == 1
+    
+    def test_balanced_board_without_tiling(self):
+        """Test that a board balanced in colour but with an isolated position is rejected."""
+        valid_positions = {Position(0, 0), Position(0, 1), Position(0, 2), Position(2, 1)}
+        board = Board(valid_positions=valid_positions, regions=[])
+        solver = PipsSolver(board)
+        
+        assert solver._can_cover() is True
+        assert can_tile(board) is False
+        assert solver.solve() is False
+
+
+class TestArcConsistency:
+    """Tests for the arc consistency preprocessing."""
+    
+    def test_ac3_follows_dominoes_and_sums(self):
+        """Test that a fixed value narrows its neighbour to the matching tile halves."""
+        regions = [Region({Position(0, 0)}, Constraint(ConstraintType.SUM, 1))]
+        board = Board(rows=1, cols=2, regions=regions, available_dominoes=[(1, 2), (3, 4)])
+        
+        domains = ac3(board, board.available_dominoes)
+        assert domains[pack(0, 0)] == 1 << 1
+        assert domains[pack(0, 1)] == 1 << 2
+        
+    def test_ac3_detects_unsolvable_equal_region(self):
+        """Test that an equal region without a usable double empties its domains."""
+        regions = [Region({Position(0, 0), Position(0, 1)}, Constraint(ConstraintType.EQUAL))]
+        board = Board(rows=1, cols=2, regions=regions, available_dominoes=[(1, 2)])
+        
+        assert ac3(board, board.available_dominoes)[pack(0, 0)] == 0
+        assert PipsSolver(board).solve() is False
+        
+        board = Board(rows=1, cols=2, regions=regions, available_dominoes=[(1, 2), (3, 3)])
+        domains = ac3(board, board.available_dominoes)
+        assert domains[pack(0, 0)] == domains[pack(0, 1)] == 1 << 3
+
+
+class TestSolutionCache:
+    """Tests for the on-disk solution cache."""
+    
+    def test_canonical_key_ignores_listing_order(self):
+        """Test that the same puzzle hashes the same however it is listed."""
+        first = Board(rows=1, cols=2, regions=[
+            Region({Position(0, 0)}, Constraint(ConstraintType.SUM, 1)),
+            Region({Position(0, 1)}, Constraint(ConstraintType.SUM, 2)),
+        ], available_dominoes=[(1, 2), (3, 4)])
+        second = Board(valid_positions={Position(0, 1), Position(0, 0)}, regions=[
+            Region({Position(0, 1)}, Constraint(ConstraintType.SUM, 2)),
+            Region({Position(0, 0)}, Constraint(ConstraintType.SUM, 1)),
+        ], available_dominoes=[(4, 3), (2, 1)])
+        other = Board(rows=1, cols=2, regions=[], available_dominoes=[(1, 2), (3, 4)])
+        
+        assert cache.canonical_key(first) == cache.canonical_key(second)
+        assert cache.canonical_key(first) != cache.canonical_key(other)
+        
+    def test_solver_reuses_cached_solution(self, monkeypatch, tmp_path):
+        """Test that a solved puzzle is answered from the cache the next time."""
+        monkeypatch.setenv("PIPS_SOLVER_CACHE", "1")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        regions = [Region({Position(0, 0), Position(1, 0)}, Constraint(ConstraintType.SUM, 5))]
+        
+        board = Board(rows=2, cols=2, regions=regions)
+        assert PipsSolver(board).solve() is True
+        solution = {pos: board.get_dots(pos) for pos in board.valid_positions}
+        
+        def fail(self):
+            raise AssertionError("search should not run on a cache hit")
+        monkeypatch.setattr(PipsSolver, "_search", fail)
+        board = Board(rows=2, cols=2, regions=regions)
+        assert PipsSolver(board).solve() is True
+        assert {pos: board.get_dots(pos) for pos in board.valid_positions} == solution
+        assert len(board.placed_dominoes) == 2
+        
+    def test_solver_ignores_damaged_cache_entry(self, monkeypatch, tmp_path):
+        """Test that a cached solution which does not fit the board is ignored."""
+        monkeypatch.setenv("PIPS_SOLVER_CACHE", "1")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        board = Board(rows=1, cols=2, regions=[], available_dominoes=[(1, 2)])
+        key = cache.canonical_key(board)
+        cache.put(key, [(pack(0, 0), pack(0, 1), 3, 3)])
+        
+        assert PipsSolver(board).solve() is True
+        assert sorted(board.placed_dominoes[0].get_dots()) == [1, 2]
+        # The entry is replaced by the solution found
+        assert sorted(cache.get(key)[0][4:]) == [1, 2]